@@ -0,0 +1,80 @@
+import hmac
+
+import dati
+
+
+def _normalizza(valori):
+    # Come al login: testo senza spazi; i PIN letti come float ("1234.0") tornano interi
+    return valori.astype(str).str.strip().str.replace(r"^(\d+)\.0$", r"\1", regex=True)
+
+
+class Utente:
+    """Utente collegato: pochi campi fissi e niente PIN, si legge come una riga (``utente['nome']``)."""
+
+    __slots__ = ("nome", "ruolo", "data_nascita", "peso", "genere")
+
+    def __init__(self, nome, ruolo, data_nascita, peso, genere):
+        self.nome = nome
+        self.ruolo = ruolo
+        self.data_nascita = data_nascita
+        self.peso = peso
+        self.genere = genere
+
+    def __getitem__(self, campo):
+        return getattr(self, campo)
+
+    def get(self, campo, predefinito=None):
+        return getattr(self, campo, predefinito)
+
+    def __repr__(self):
+        return f"Utente({self.nome!r}, {self.ruolo!r})"
+
+
+class IndiceCredenziali(dati.StrutturaCondivisa):
+    """Indice (nome normalizzato, ruolo) -> [(PIN, Utente)].
+
+    Il login diventa una ricerca in un dizionario invece di una scansione di tutta la tabella.
+    """
+
+    TABELLE = ("utenti",)
+
+    def __init__(self):
+        super().__init__()
+        self._utenti = {}
+
+    def _ricostruisci(self):
+        utenti = dati.carica("utenti")
+        nomi, ruoli, pin = _normalizza(utenti["nome"]), _normalizza(utenti["ruolo"]), _normalizza(utenti["pin"])
+        indice = {}
+        for chiave in zip(nomi, ruoli, pin, utenti["data_nascita"], utenti["peso"], utenti["genere"]):
+            nome, ruolo, codice, data_nascita, peso, genere = chiave
+            # Omonimi con lo stesso ruolo (righe vecchie): si tengono tutti, ognuno col suo PIN
+            utente = Utente(nome, ruolo, data_nascita, peso, genere)
+            indice.setdefault((nome, ruolo), []).append((codice.encode("utf-8"), utente))
+        self._utenti = indice
+
+    def accedi(self, nome, ruolo, pin):
+        """L'utente se nome, ruolo e PIN sono corretti, altrimenti None."""
+        with self._lock:
+            candidati = self._utenti.get((nome.strip(), ruolo), [])
+        # Confronto in byte: compare_digest non accetta stringhe con caratteri non ASCII
+        pin = pin.strip().encode("utf-8")
+        for codice, utente in candidati:
+            if hmac.compare_digest(codice, pin):
+                return utente
+        return None
+
+    def utente(self, nome, ruolo):
+        """Dati aggiornati di un utente già collegato (None se nel frattempo è stato eliminato)."""
+        with self._lock:
+            candidati = self._utenti.get((nome, ruolo))
+        # Il profilo si modifica per nome: gli omonimi hanno comunque gli stessi dati
+        return candidati[0][1] if candidati else None
+
+
+_credenziali = IndiceCredenziali()
+
+
+def credenziali():
+    """Indice delle credenziali per il login."""
+    return _credenziali.allinea()
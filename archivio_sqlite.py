@@ -0,0 +1,127 @@
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+
+import dati
+
+# Indici per le query più frequenti: per atleta, per esercizio e per data
+INDICI = {
+    "test": [("nome", "esercizio", "data"), ("esercizio", "genere"), ("data",)],
+    "wod_risultati": [("data_wod",), ("nome",)],
+    "utenti": [("nome", "ruolo")],
+    "benchmark": [("esercizio", "genere")],
+    "esercizi": [("esercizio",)],
+    "wod": [("data",)],
+}
+
+
+def _parametro(valore):
+    # Le date sono salvate come testo "YYYY-MM-DD": l'ordine del testo è quello delle date
+    return valore.strftime("%Y-%m-%d") if isinstance(valore, pd.Timestamp) else valore
+
+
+class ArchivioSqlite:
+    """Le stesse tabelle dei CSV in un unico file SQLite, con indici su atleta, esercizio e data."""
+
+    def __init__(self, percorso_db):
+        self.engine = create_engine(f"sqlite:///{percorso_db}")
+        with self.engine.begin() as con:
+            # Contatore per tabella: fa da "firma" per la cache di dati.py
+            con.execute(text("CREATE TABLE IF NOT EXISTS _versioni (tabella TEXT PRIMARY KEY, versione INTEGER NOT NULL)"))
+
+    def firma(self, nome):
+        with self.engine.connect() as con:
+            return con.execute(text("SELECT versione FROM _versioni WHERE tabella = :t"), {"t": nome}).scalar()
+
+    def leggi(self, nome):
+        with self.engine.connect() as con:
+            if not inspect(con).has_table(nome):
+                if nome not in dati.COLONNE_INIZIALI:
+                    raise FileNotFoundError(f"Tabella '{nome}' assente: esegui prima 'python dati.py migra-sqlite'")
+                return pd.DataFrame(columns=dati.COLONNE_INIZIALI[nome]), 0
+            return self._leggi_righe(con, f'SELECT rowid - 1 AS _riga, * FROM "{nome}" ORDER BY rowid'), 0
+
+    def scrivi(self, nome, df):
+        with self.engine.begin() as con:
+            dati.per_disco(nome, df).to_sql(nome, con, if_exists="replace", index=False)
+            self._crea_indici(con, nome)
+            self._incrementa_versione(con, nome)
+
+    def accoda(self, nome, righe):
+        with self.engine.begin() as con:
+            nuova = not inspect(con).has_table(nome)
+            dati.per_disco(nome, righe).to_sql(nome, con, if_exists="append", index=False)
+            if nuova:
+                self._crea_indici(con, nome)
+            self._incrementa_versione(con, nome)
+        return 0  # nessun giornale da compattare
+
+    def leggi_a_blocchi(self, nome, righe):
+        with self.engine.connect() as con:
+            if not inspect(con).has_table(nome):
+                return
+            query = text(f'SELECT rowid - 1 AS _riga, * FROM "{nome}" ORDER BY rowid')
+            for blocco in pd.read_sql(query, con, index_col="_riga", chunksize=righe):
+                blocco.index.name = None
+                yield blocco
+
+    def leggi_filtrato(self, nome, colonna, valore):
+        with self.engine.connect() as con:
+            if not inspect(con).has_table(nome):
+                return None
+            query = f'SELECT rowid - 1 AS _riga, * FROM "{nome}" WHERE "{colonna}" = :valore ORDER BY rowid'
+            return self._leggi_righe(con, query, {"valore": valore})
+
+    def leggi_intervallo(self, nome, colonna, inizio, fine):
+        with self.engine.connect() as con:
+            if not inspect(con).has_table(nome):
+                return None
+            parametri = {"inizio": _parametro(inizio), "fine": _parametro(fine)}
+            query = (f'SELECT rowid - 1 AS _riga, * FROM "{nome}" '
+                     f'WHERE "{colonna}" >= :inizio AND "{colonna}" < :fine ORDER BY "{colonna}", rowid')
+            return self._leggi_righe(con, query, parametri)
+
+    def sfoglia(self, nome, uguali, tra, ordina_per, crescente, inizio, quante):
+        with self.engine.connect() as con:
+            if not inspect(con).has_table(nome):
+                return None
+            condizioni, parametri = [], {}
+            for i, (colonna, valori) in enumerate(uguali.items()):
+                segnaposti = []
+                for j, valore in enumerate(valori):
+                    parametri[f"u{i}_{j}"] = valore
+                    segnaposti.append(f":u{i}_{j}")
+                condizioni.append(f'"{colonna}" IN ({", ".join(segnaposti)})')
+            for i, (colonna, (da, a)) in enumerate(tra.items()):
+                if da is not None:
+                    condizioni.append(f'"{colonna}" >= :da{i}')
+                    parametri[f"da{i}"] = _parametro(da)
+                if a is not None:
+                    condizioni.append(f'"{colonna}" <= :a{i}')
+                    parametri[f"a{i}"] = _parametro(a)
+            dove = f" WHERE {' AND '.join(condizioni)}" if condizioni else ""
+
+            # Si conta sull'indice e si legge solo la pagina richiesta
+            totale = con.execute(text(f'SELECT COUNT(*) FROM "{nome}"{dove}'), parametri).scalar()
+            # Valori mancanti in fondo in entrambi i versi, come nell'ordinamento di pandas
+            ordine = f'"{ordina_per}" IS NULL, "{ordina_per}" {"ASC" if crescente else "DESC"}, ' if ordina_per else ""
+            query = f'SELECT rowid - 1 AS _riga, * FROM "{nome}"{dove} ORDER BY {ordine}rowid LIMIT :quante OFFSET :inizio'
+            return self._leggi_righe(con, query, {**parametri, "quante": quante, "inizio": inizio}), totale
+
+    def _leggi_righe(self, con, query, parametri=None):
+        # L'indice del DataFrame è il rowid: le righe filtrate hanno le stesse etichette della tabella intera
+        df = pd.read_sql(text(query), con, params=parametri, index_col="_riga")
+        df.index.name = None
+        return df
+
+    def _crea_indici(self, con, nome):
+        for colonne in INDICI.get(nome, []):
+            nome_indice = f"idx_{nome}_{'_'.join(colonne)}"
+            elenco = ", ".join(f'"{colonna}"' for colonna in colonne)
+            con.execute(text(f'CREATE INDEX IF NOT EXISTS "{nome_indice}" ON "{nome}" ({elenco})'))
+
+    def _incrementa_versione(self, con, nome):
+        con.execute(
+            text("INSERT INTO _versioni (tabella, versione) VALUES (:t, 1) "
+                 "ON CONFLICT(tabella) DO UPDATE SET versione = versione + 1"),
+            {"t": nome},
+        )
@@ -0,0 +1,59 @@
+import pandas as pd
+
+import dati
+from livelli_correnti import livelli_correnti
+
+
+def _pivot(livelli, categorie):
+    # Livello medio (1-5) dell'ultimo test di ogni esercizio valutabile, per atleta e categoria
+    valutati = livelli[livelli["livello_num"] > 0]
+    valutati = valutati.assign(categoria=valutati["esercizio"].map(categorie))
+    return valutati.pivot_table(index="nome", columns="categoria", values="livello_num", aggfunc="mean").round(2)
+
+
+class MatriceAree(dati.StrutturaCondivisa):
+    """Matrice atleta × categoria dei livelli normalizzati sui benchmark (1-5).
+
+    Viene da un unico pivot sui livelli correnti; dopo un salvataggio si rifanno solo le righe
+    degli atleti toccati.
+    """
+
+    TABELLE = ("test", "benchmark", "esercizi", "utenti")
+    INCREMENTALE = "test"
+
+    def __init__(self):
+        super().__init__()
+        self._matrice = pd.DataFrame()
+
+    def _ricostruisci(self):
+        esercizi = dati.carica("esercizi").drop_duplicates("esercizio")
+        self._imposta(_pivot(livelli_correnti().tabella(), esercizi.set_index("esercizio")["categoria"]), esercizi)
+
+    def _applica(self, modifiche):
+        nomi = {nome for _, righe in modifiche for nome in righe["nome"]}
+        esercizi = dati.carica("esercizi").drop_duplicates("esercizio")
+        matrice = self._matrice.drop(index=list(nomi), errors="ignore")
+        if nomi:
+            correnti = livelli_correnti()
+            livelli = pd.concat([correnti.atleta(nome).assign(nome=nome) for nome in nomi], ignore_index=True)
+            matrice = pd.concat([matrice, _pivot(livelli, esercizi.set_index("esercizio")["categoria"])])
+        self._imposta(matrice, esercizi)
+
+    def _imposta(self, matrice, esercizi):
+        # Categorie nell'ordine dell'elenco esercizi, solo quelle con almeno un livello
+        ordine = [categoria for categoria in esercizi["categoria"].unique() if categoria in matrice]
+        self._matrice = matrice.reindex(columns=ordine).sort_index()
+        self._matrice.columns.name = None
+
+    def matrice(self):
+        """Una riga per atleta, una colonna per categoria (NaN se l'atleta non ha test valutati)."""
+        with self._lock:
+            return self._matrice.copy(deep=False)
+
+
+_matrice = MatriceAree()
+
+
+def matrice_aree():
+    """Matrice atleta × categoria di tutti gli atleti."""
+    return _matrice.allinea()
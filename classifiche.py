@@ -0,0 +1,214 @@
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+import dati
+import valutazione
+
+_punteggio = itemgetter(0)
+
+
+class Classifica:
+    """Miglior risultato di ogni atleta per un (esercizio, genere), sempre ordinato.
+
+    ``ordine`` contiene coppie (punteggio, nome) in ordine crescente: il punteggio è il
+    valore normalizzato per il tempo (meno è meglio) e il suo opposto per gli altri tipi,
+    così la prima posizione è sempre la migliore. Ci sono tutti gli atleti, non solo i primi:
+    ``posizione`` deve dare il posto di chiunque. Trovare un punteggio o una posizione con bisect
+    costa O(log n), ma inserire o togliere una coppia con ``insort``/``del`` sposta la coda della
+    lista e costa O(n): per le poche centinaia di atleti di un (esercizio, genere) resta immediato.
+    """
+
+    __slots__ = ("ordine", "migliori")
+
+    def __init__(self):
+        self.ordine = []
+        self.migliori = {}  # nome -> (punteggio, valore, data)
+
+    def __len__(self):
+        return len(self.ordine)
+
+    def aggiorna(self, nome, punteggio, valore, data):
+        """Registra un risultato; restituisce True se migliora il record dell'atleta."""
+        attuale = self.migliori.get(nome)
+        if attuale is not None:
+            if punteggio >= attuale[0]:
+                return False
+            del self.ordine[bisect_left(self.ordine, (attuale[0], nome))]
+        insort(self.ordine, (punteggio, nome))
+        self.migliori[nome] = (punteggio, valore, data)
+        return True
+
+    def rimuovi(self, nome):
+        attuale = self.migliori.pop(nome, None)
+        if attuale is not None:
+            del self.ordine[bisect_left(self.ordine, (attuale[0], nome))]
+
+    def posizione(self, nome):
+        """Posizione (1 = migliore, pari merito condiviso) e percentile dell'atleta, oppure (None, None)."""
+        attuale = self.migliori.get(nome)
+        if attuale is None:
+            return None, None
+        davanti = bisect_left(self.ordine, attuale[0], key=_punteggio)
+        # Percentuale degli altri atleti con un risultato peggiore
+        peggiori = len(self.ordine) - bisect_right(self.ordine, attuale[0], key=_punteggio)
+        percentile = 100.0 * peggiori / (len(self.ordine) - 1) if len(self.ordine) > 1 else 100.0
+        return davanti + 1, percentile
+
+    def prime(self, k):
+        """Le prime ``k`` posizioni come lista di (posizione, nome, valore, data)."""
+        righe = []
+        for i, (punteggio, nome) in enumerate(self.ordine[:k]):
+            posizione = righe[-1][0] if righe and punteggio == self.ordine[i - 1][0] else i + 1
+            _, valore, data = self.migliori[nome]
+            righe.append((posizione, nome, valore, data))
+        return righe
+
+
+def _punteggi(test_df):
+    # Valore normalizzato con il verso giusto: crescente = migliore posizione
+    tipo = test_df["tipo_valore"].astype(object)
+    valore = valutazione.valore_normalizzato(test_df, tipo)
+    return valore.where(tipo == "tempo", -valore)
+
+
+def _con_punteggi(test_df):
+    # Test con genere (anche dal profilo dell'atleta) e punteggio, pronti per la classifica
+    test_df = valutazione.con_genere(test_df, valutazione.generi_atleti())
+    return test_df.assign(punteggio=_punteggi(test_df)).dropna(subset=["punteggio", "genere"])
+
+
+class Classifiche(dati.StrutturaCondivisa):
+    """Una ``Classifica`` per ogni (esercizio, genere); gli utenti servono per il genere dei test salvati senza."""
+
+    TABELLE = ("test", "utenti")
+    INCREMENTALE = "test"
+
+    def __init__(self):
+        super().__init__()
+        self._classifiche = {}  # (esercizio, genere) -> Classifica
+
+    def _applica(self, modifiche):
+        for tipo, righe in modifiche:
+            if tipo == "aggiunte":
+                self._inserisci(righe)
+            else:
+                self._ricalcola(righe)
+
+    def _inserisci(self, test_df):
+        test_df = _con_punteggi(test_df)
+        for riga in test_df.itertuples(index=False):
+            classifica = self._classifiche.setdefault((riga.esercizio, riga.genere), Classifica())
+            classifica.aggiorna(riga.nome, riga.punteggio, riga.valore, riga.data)
+
+    def _ricostruisci(self):
+        test_df = _con_punteggi(dati.carica("test"))
+        # Un solo passaggio: il miglior test per (esercizio, genere, nome), già ordinato per punteggio
+        migliori = test_df.sort_values(["punteggio", "data"], kind="stable")
+        migliori = migliori.drop_duplicates(["esercizio", "genere", "nome"])
+
+        classifiche = {}
+        for (esercizio, genere), gruppo in migliori.groupby(["esercizio", "genere"], observed=True, sort=False):
+            classifica = Classifica()
+            classifica.ordine = sorted(zip(gruppo["punteggio"], gruppo["nome"].astype(object)))
+            classifica.migliori = {
+                nome: (punteggio, valore, data)
+                for nome, punteggio, valore, data in zip(gruppo["nome"], gruppo["punteggio"], gruppo["valore"], gruppo["data"])
+            }
+            classifiche[(esercizio, genere)] = classifica
+        self._classifiche = classifiche
+
+    def _ricalcola(self, eliminate):
+        # Dopo un'eliminazione il record di un atleta va ricalcolato dai suoi test rimasti
+        for nome, esercizi in eliminate.groupby("nome", observed=True)["esercizio"]:
+            test_atleta = dati.filtra("test", "nome", nome)
+            for esercizio in set(esercizi):
+                for chiave, classifica in self._classifiche.items():
+                    if chiave[0] == esercizio:
+                        classifica.rimuovi(nome)
+                self._inserisci(test_atleta[test_atleta["esercizio"] == esercizio])
+
+    def prime(self, esercizio, genere, k=10):
+        """Le prime ``k`` posizioni come DataFrame, con il livello del risultato."""
+        indice = valutazione.indice_benchmark()
+        with self._lock:
+            classifica = self._classifiche.get((esercizio, genere))
+            righe = classifica.prime(k) if classifica is not None else []
+            punteggi = [classifica.migliori[nome][0] for _, nome, _, _ in righe]
+        # Il punteggio è il valore normalizzato, col segno invertito se più alto è meglio
+        livelli = [indice.livello(esercizio, genere, abs(punteggio)) for punteggio in punteggi]
+        return pd.DataFrame({
+            "posizione": [r[0] for r in righe],
+            "nome": [r[1] for r in righe],
+            "valore": [r[2] for r in righe],
+            "livello": valutazione.etichetta(np.array(livelli, dtype=int)),
+            "data": [r[3] for r in righe],
+        })
+
+    def posizione(self, esercizio, genere, nome):
+        with self._lock:
+            classifica = self._classifiche.get((esercizio, genere))
+            if classifica is None:
+                return None, None, 0
+            return (*classifica.posizione(nome), len(classifica))
+
+
+_classifiche = Classifiche()
+
+
+def classifiche():
+    """Classifiche di tutti gli (esercizio, genere)."""
+    return _classifiche.allinea()
+
+
+class ClassificheWod(dati.StrutturaCondivisa):
+    """Risultati dei WOD divisi per giorno, ciascun giorno già ordinato per la classifica.
+
+    Ogni giorno è una lista di (punteggio, riga, nome, livello, risultato): il punteggio
+    è in secondi per il tempo e negativo per reps/round, così il primo è sempre il migliore.
+    Ogni risultato nuovo entra con ``insort``: O(n) nei risultati di quel giorno.
+    """
+
+    TABELLE = ("wod_risultati",)
+    INCREMENTALE = "wod_risultati"
+
+    def __init__(self):
+        super().__init__()
+        self._giorni = {}  # data_wod -> lista ordinata
+
+    def _ricostruisci(self):
+        self._giorni = {}
+        self._inserisci(dati.carica("wod_risultati"))
+
+    def _applica(self, modifiche):
+        # Solo le aggiunte si inseriscono al loro posto; un'eliminazione rinumera le righe
+        if any(tipo != "aggiunte" for tipo, _ in modifiche):
+            self._ricostruisci()
+            return
+        for _, righe in modifiche:
+            self._inserisci(righe)
+
+    def _inserisci(self, risultati_df):
+        punteggi = risultati_df["valore_num"].where(risultati_df["tipo_valore"] == "tempo", -risultati_df["valore_num"])
+        righe = zip(
+            risultati_df["data_wod"], punteggi.fillna(float("inf")), risultati_df.index,
+            risultati_df["nome"], risultati_df["livello"], risultati_df["risultato"],
+        )
+        for data, punteggio, riga, nome, livello, risultato in righe:
+            insort(self._giorni.setdefault(data, []), (punteggio, riga, nome, livello, risultato))
+
+    def del_giorno(self, data):
+        """Classifica di un giorno (la lista è già ordinata: nessun ordinamento a ogni lettura)."""
+        with self._lock:
+            giorno = list(self._giorni.get(pd.Timestamp(data), []))
+        return pd.DataFrame([voce[2:] for voce in giorno], columns=["nome", "livello", "risultato"])
+
+
+_classifiche_wod = ClassificheWod()
+
+
+def classifiche_wod():
+    """Classifiche giornaliere dei WOD."""
+    return _classifiche_wod.allinea()
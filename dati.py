@@ -0,0 +1,755 @@
+import argparse
+import atexit
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Copy-on-write: le sessioni ricevono copie "leggere" dei DataFrame in cache,
+# quindi una modifica locale non può sporcare la copia condivisa.
+pd.set_option("mode.copy_on_write", True)
+
+CARTELLA_DATI = "fitness_app"
+
+# Archivio da usare: "csv" (predefinito) oppure "sqlite"
+ARCHIVIO = os.environ.get("FITNESS_ARCHIVIO", "csv")
+PERCORSO_SQLITE = os.path.join(CARTELLA_DATI, "fitness.db")
+
+# Nome logico della tabella -> file CSV nella cartella dati
+TABELLE = {
+    "utenti": "utenti.csv",
+    "esercizi": "esercizi.csv",
+    "test": "test.csv",
+    "benchmark": "benchmark.csv",
+    "wod": "wod.csv",
+    "wod_risultati": "wod_risultati.csv",
+}
+
+# Tabelle che vengono create vuote se il file non esiste
+COLONNE_INIZIALI = {
+    "wod": ["data", "titolo", "descrizione"],
+    "wod_risultati": ["nome", "data_wod", "livello", "risultato", "tipo_valore"],
+}
+
+# Schema dichiarato, applicato una volta al caricamento: categorie per le colonne con pochi
+# valori distinti, date vere al posto del testo e numeri float
+SCHEMI = {
+    "test": {
+        "categorie": ["nome", "esercizio", "genere", "tipo_valore"],
+        "date": ["data"],
+        "numeri": ["peso_corporeo", "relativo"],
+    },
+    "wod_risultati": {
+        "categorie": ["nome", "livello", "tipo_valore"],
+        "date": ["data_wod"],
+    },
+}
+
+# Colonne calcolate al caricamento: non vengono salvate
+COLONNE_DERIVATE = {
+    # valore in float con i "mm:ss" già convertiti in secondi; testo delle date non riconosciute
+    "test": ["valore_num", "data_originale"],
+    "wod_risultati": ["valore_num", "data_wod_originale"],  # idem per il risultato del WOD
+}
+
+# Formati di data letti dalle tabelle: l'ISO con cui l'app salva e il gg/mm/aaaa accettato
+# dall'importazione. Il testo di una data non riconosciuta resta in "<colonna>_originale"
+# e torna nel file al salvataggio, così una riscrittura non la cancella.
+FORMATI_DATA = ["%Y-%m-%d", "%d/%m/%Y"]
+
+# Colonna da cui si ricava valore_num
+COLONNE_VALORE = {"test": "valore", "wod_risultati": "risultato"}
+
+# Oltre questo numero di righe il giornale degli inserimenti viene riversato nel CSV principale
+SOGLIA_COMPATTAZIONE = 500
+
+# Quante modifiche recenti tenere per tabella, per chi si aggiorna in modo incrementale
+LUNGHEZZA_REGISTRO = 256
+
+_cache = {}  # nome tabella -> _Voce
+_registro = {}  # nome tabella -> deque di (versione, tipo, righe)
+_lock = {nome: threading.RLock() for nome in TABELLE}  # uno per tabella: chi legge gli utenti non aspetta i test
+_letture = threading.local()  # versioni fissate dall'esecuzione in corso in questo thread
+_scrittori = {}  # nome tabella -> _Scrittore
+_in_coda = {}  # nome tabella -> scritture in coda non ancora finite
+_log = logging.getLogger(__name__)
+
+
+class _Voce:
+    """Versione immutabile di una tabella: una scrittura crea una nuova voce, non modifica questa."""
+
+    __slots__ = ("firma", "df", "versione", "righe_giornale", "gruppi", "ordinamenti")
+
+    def __init__(self, firma, df, versione, righe_giornale=0):
+        self.firma = firma
+        self.df = df
+        self.versione = versione
+        self.righe_giornale = righe_giornale
+        self.gruppi = {}  # colonna -> {valore: posizioni}, costruito al primo filtro
+        self.ordinamenti = {}  # colonna -> colonna ordinata (con le etichette originali)
+
+
+def percorso(nome):
+    return os.path.join(CARTELLA_DATI, TABELLE[nome])
+
+
+def percorso_giornale(nome):
+    # es. fitness_app/test.csv -> fitness_app/test.giornale.csv
+    base, estensione = os.path.splitext(percorso(nome))
+    return f"{base}.giornale{estensione}"
+
+
+# Correggi automaticamente i formati di data non validi
+def correggi_date(df, colonna_data, data_predefinita="1970-01-01"):
+    df[colonna_data] = pd.to_datetime(df[colonna_data], format="%Y-%m-%d", errors="coerce")
+    if df[colonna_data].isnull().any():
+        df[colonna_data] = df[colonna_data].fillna(pd.to_datetime(data_predefinita))
+    return df
+
+
+def in_secondi(valori):
+    """Converte una serie di valori "mm:ss" (o già numerici) in secondi."""
+    testo = pd.Series(valori).astype(str).str.strip()
+    parti = testo.str.extract(r"^(\d+):(\d{1,2})$").astype(float)
+    secondi = parti[0] * 60 + parti[1]
+    return secondi.fillna(pd.to_numeric(testo, errors="coerce").astype(float))
+
+
+def in_date(valori):
+    """Converte una serie di date scritte come testo (vedi ``FORMATI_DATA``); NaT se non riconosciute."""
+    date = pd.to_datetime(valori, format=FORMATI_DATA[0], errors="coerce")
+    for formato in FORMATI_DATA[1:]:
+        date = date.fillna(pd.to_datetime(valori, format=formato, errors="coerce"))
+    return date
+
+
+def _originale(colonna):
+    return f"{colonna}_originale"
+
+
+def _prepara(nome, df):
+    if nome == "wod":
+        df = correggi_date(df, "data")
+
+    schema = SCHEMI.get(nome)
+    if schema is None:
+        return df
+    tipi = {colonna: "category" for colonna in schema.get("categorie", [])}
+    tipi.update({colonna: "float64" for colonna in schema.get("numeri", [])})
+    df = df.astype(tipi)
+    for colonna in schema.get("date", []):
+        testo = df[colonna]
+        df[colonna] = in_date(testo)
+        non_valide = df[colonna].isna() & testo.notna()
+        if non_valide.any():
+            _log.warning("Tabella '%s': %d date non riconosciute in '%s' (es. %r), conservate come testo",
+                         nome, non_valide.sum(), colonna, testo[non_valide].iloc[0])
+            df[_originale(colonna)] = testo.where(non_valide).astype(object)
+    if nome in COLONNE_VALORE:
+        df["valore_num"] = in_secondi(df[COLONNE_VALORE[nome]]).to_numpy()
+    return df
+
+
+def per_disco(nome, df):
+    """Copia della tabella pronta da salvare: via le colonne derivate, date in testo "YYYY-MM-DD"."""
+    colonne_data = df.select_dtypes(include="datetime").columns
+    testo = {colonna: df[colonna].dt.strftime("%Y-%m-%d") for colonna in colonne_data}
+    for colonna in colonne_data:
+        # Le date non riconosciute al caricamento tornano nel file com'erano
+        if _originale(colonna) in df.columns:
+            testo[colonna] = testo[colonna].fillna(df[_originale(colonna)])
+    return df.assign(**testo).drop(columns=COLONNE_DERIVATE.get(nome, []), errors="ignore")
+
+
+def _firma_file(path):
+    # mtime + dimensione: basta a capire se il file è cambiato dall'ultima lettura
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (info.st_mtime_ns, info.st_size)
+
+
+class ArchivioCsv:
+    """Ogni tabella è un CSV nella cartella dati, più un eventuale giornale degli inserimenti."""
+
+    def firma(self, nome):
+        return (_firma_file(percorso(nome)), _firma_file(percorso_giornale(nome)))
+
+    def leggi(self, nome):
+        path = percorso(nome)
+        if not os.path.exists(path) and nome in COLONNE_INIZIALI:
+            pd.DataFrame(columns=COLONNE_INIZIALI[nome]).to_csv(path, index=False)
+        df = pd.read_csv(path)
+        righe_giornale = 0
+        if os.path.exists(percorso_giornale(nome)):
+            # Letto da solo il giornale diventerebbe numerico dove la tabella ha testo ("90.0" -> 90.0)
+            testo = {colonna: str for colonna in df.columns if df[colonna].dtype == object and df[colonna].notna().any()}
+            giornale = pd.read_csv(percorso_giornale(nome), dtype=testo)
+            righe_giornale = len(giornale)
+            if righe_giornale:
+                df = pd.concat([df, giornale.reindex(columns=df.columns)], ignore_index=True)
+        return df, righe_giornale
+
+    def scrivi(self, nome, df):
+        # Scrive su un file temporaneo e lo rinomina: chi legge non vede mai un CSV a metà
+        path = percorso(nome)
+        temporaneo = f"{path}.tmp"
+        per_disco(nome, df).to_csv(temporaneo, index=False)
+        os.replace(temporaneo, path)
+        # Il CSV riscritto contiene già tutto: il giornale non serve più
+        if os.path.exists(percorso_giornale(nome)):
+            os.remove(percorso_giornale(nome))
+
+    def accoda(self, nome, righe):
+        """Accoda al giornale; restituisce quante righe ci sono finite."""
+        giornale = percorso_giornale(nome)
+        nuovo = not os.path.exists(giornale)
+        with open(giornale, "a", newline="", encoding="utf-8") as f:
+            per_disco(nome, righe).to_csv(f, header=nuovo, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(righe)
+
+    def leggi_a_blocchi(self, nome, righe):
+        # Prima il CSV principale, poi il giornale, senza mai caricarli interi
+        colonne = None
+        for path in (percorso(nome), percorso_giornale(nome)):
+            if not os.path.exists(path):
+                continue
+            for blocco in pd.read_csv(path, chunksize=righe):
+                colonne = colonne if colonne is not None else blocco.columns
+                yield blocco.reindex(columns=colonne)
+
+    def leggi_filtrato(self, nome, colonna, valore):
+        # Nessun indice su file: si filtra la tabella in cache
+        return None
+
+    def leggi_intervallo(self, nome, colonna, inizio, fine):
+        return None
+
+    def sfoglia(self, nome, uguali, tra, ordina_per, crescente, inizio, quante):
+        return None
+
+
+def _crea_archivio():
+    if ARCHIVIO == "sqlite":
+        from archivio_sqlite import ArchivioSqlite  # SQLAlchemy serve solo con questo archivio
+        return ArchivioSqlite(PERCORSO_SQLITE)
+    return ArchivioCsv()
+
+
+_archivio = _crea_archivio()
+
+
+def _registra(nome, versione, tipo, righe=None):
+    _registro.setdefault(nome, deque(maxlen=LUNGHEZZA_REGISTRO)).append((versione, tipo, righe))
+
+
+def _pubblica(nome, voce):
+    # Sostituzione atomica della voce condivisa; chi scrive vede subito la propria modifica
+    _cache[nome] = voce
+    voci = getattr(_letture, "voci", None)
+    if voci is not None:
+        voci[nome] = voce
+
+
+def _voce_aggiornata(nome):
+    with _lock[nome]:
+        firma = _archivio.firma(nome)
+        voce = _cache.get(nome)
+        # Con scritture in coda l'archivio è indietro rispetto alla memoria: vale la memoria
+        if voce is None or (voce.firma != firma and not _in_coda.get(nome)):
+            df, righe_giornale = _archivio.leggi(nome)
+            versione = voce.versione + 1 if voce is not None else 1
+            # La firma letta prima: se l'archivio cambia durante la lettura, la prossima se ne accorge
+            voce = _Voce(firma, _prepara(nome, df), versione, righe_giornale)
+            _pubblica(nome, voce)
+            _registra(nome, versione, "riscrittura")
+    return voce
+
+
+def _segna_lettura(nome, fissata, voce=None):
+    # Per versioni_lette: quale versione della tabella è stata letta, e se era quella fissata
+    lette = getattr(_letture, "lette", None)
+    if lette is not None:
+        lette[(nome, fissata)] = (voce or _voce_aggiornata(nome)).versione
+
+
+def _voce_letta(nome):
+    # Dentro un'esecuzione con versioni fissate, la prima lettura fissa la versione della tabella
+    voci = getattr(_letture, "voci", None)
+    if voci is None:
+        voce = _voce_aggiornata(nome)
+    else:
+        voce = voci.get(nome)
+        if voce is None:
+            voce = voci[nome] = _voce_aggiornata(nome)
+    _segna_lettura(nome, voci is not None, voce)
+    return voce
+
+
+def fissa_versioni(scritture=None):
+    """Da chiamare all'inizio di ogni esecuzione dello script (o di un frammento).
+
+    Da qui in poi, nello stesso thread, ogni tabella viene letta sempre nella versione
+    trovata alla prima lettura, anche se un'altra sessione la modifica nel frattempo: una
+    pagina non mescola mai dati di versioni diverse. Le scritture fatte da questa esecuzione
+    sono invece visibili subito. Tutte le sessioni condividono le stesse versioni in memoria.
+    Con SQLite le letture indicizzate (``filtra``, ``intervallo``, ``sfoglia``) interrogano il
+    database e vedono sempre l'ultima versione.
+
+    ``scritture`` (facoltativa, es. una lista nello stato della sessione) raccoglie i ``Future``
+    delle scritture avviate da questa esecuzione: vedi ``scritture_fallite``.
+    """
+    _letture.voci = {}
+    _letture.scritture = scritture
+
+
+@contextmanager
+def ultime_versioni():
+    """Sospende le versioni fissate: per le strutture condivise che devono seguire l'ultima versione."""
+    voci = getattr(_letture, "voci", None)
+    _letture.voci = None
+    try:
+        yield
+    finally:
+        _letture.voci = voci
+
+
+@contextmanager
+def versioni_lette():
+    """Raccoglie le versioni delle tabelle lette nel blocco, in un dizionario {(tabella, fissata): versione}.
+
+    ``fissata`` è False per le letture fatte con ``ultime_versioni`` (le strutture condivise) e
+    per le query dirette a SQLite. Serve a chi mette in cache un risultato: vedi ``versioni_attuali``.
+    """
+    esterne = getattr(_letture, "lette", None)
+    lette = _letture.lette = {}
+    try:
+        yield lette
+    finally:
+        _letture.lette = esterne
+        if esterne is not None:
+            esterne.update(lette)
+
+
+def versioni_attuali(lette):
+    """Versioni che le stesse letture di ``versioni_lette`` troverebbero adesso."""
+    attuali = {}
+    for nome, fissata in lette:
+        if fissata:
+            attuali[(nome, fissata)] = versione(nome)
+        else:
+            with ultime_versioni():
+                attuali[(nome, fissata)] = versione(nome)
+    return attuali
+
+
+def carica(nome):
+    """Restituisce la tabella richiesta, rileggendo dall'archivio solo se è cambiata."""
+    return _voce_letta(nome).df.copy(deep=False)
+
+
+def leggi_a_blocchi(nome, righe=50_000):
+    """Tabella letta direttamente dall'archivio a blocchi di ``righe``, senza passare dalla cache.
+
+    Serve ai lavori batch su storici grandi: in memoria c'è un solo blocco per volta.
+    """
+    for blocco in _archivio.leggi_a_blocchi(nome, righe):
+        yield _prepara(nome, blocco)
+
+
+def filtra(nome, colonna, valore):
+    """Righe con ``colonna == valore`` (es. i test di un atleta) senza scandire tutta la tabella.
+
+    Con SQLite è una query sull'indice; con i CSV usa un raggruppamento della tabella in cache.
+    Finché la tabella ha scritture in coda il database è indietro: allora si legge dalla cache,
+    qui come in ``intervallo`` e ``sfoglia``.
+    """
+    df = None if _in_coda.get(nome) else _archivio.leggi_filtrato(nome, colonna, valore)
+    if df is not None:
+        _segna_lettura(nome, False)
+        return _prepara(nome, df)
+
+    voce = _voce_letta(nome)
+    gruppi = voce.gruppi.get(colonna)
+    if gruppi is None:
+        gruppi = voce.df.groupby(colonna, sort=False, observed=True).indices
+        voce.gruppi[colonna] = gruppi
+    posizioni = gruppi.get(valore)
+    if posizioni is None:
+        return voce.df.iloc[:0]
+    return voce.df.iloc[posizioni]
+
+
+def intervallo(nome, colonna, inizio, fine):
+    """Righe con ``inizio <= colonna < fine`` (es. i WOD di un mese), in ordine di ``colonna``.
+
+    Con SQLite è una query sull'indice; con i CSV una ricerca binaria su un ordinamento in cache.
+    """
+    df = None if _in_coda.get(nome) else _archivio.leggi_intervallo(nome, colonna, inizio, fine)
+    if df is not None:
+        _segna_lettura(nome, False)
+        return _prepara(nome, df)
+
+    voce = _voce_letta(nome)
+    ordinata = voce.ordinamenti.get(colonna)
+    if ordinata is None:
+        ordinata = voce.df[colonna].sort_values(kind="stable")
+        voce.ordinamenti[colonna] = ordinata
+    da, a = ordinata.searchsorted([inizio, fine])
+    return voce.df.loc[ordinata.index[da:a]]
+
+
+def sfoglia(nome, uguali=None, tra=None, ordina_per=None, crescente=True, pagina=1, righe_per_pagina=50):
+    """Una pagina della tabella filtrata e ordinata: restituisce (righe della pagina, righe totali).
+
+    ``uguali`` è {colonna: valore o lista di valori}, ``tra`` è {colonna: (da, a)} con estremi
+    inclusi (None = aperto). Viene materializzata solo la pagina richiesta.
+    """
+    uguali = {colonna: list(valori) if isinstance(valori, (list, tuple, set)) else [valori]
+              for colonna, valori in (uguali or {}).items()}
+    tra = tra or {}
+    inizio = (pagina - 1) * righe_per_pagina
+
+    risultato = None if _in_coda.get(nome) else _archivio.sfoglia(nome, uguali, tra, ordina_per, crescente, inizio, righe_per_pagina)
+    if risultato is not None:
+        _segna_lettura(nome, False)
+        df, totale = risultato
+        return _prepara(nome, df), totale
+
+    df = _voce_letta(nome).df
+    maschera = np.ones(len(df), dtype=bool)
+    for colonna, valori in uguali.items():
+        maschera &= df[colonna].isin(valori).to_numpy()
+    for colonna, (da, a) in tra.items():
+        if da is not None:
+            maschera &= (df[colonna] >= da).to_numpy()
+        if a is not None:
+            maschera &= (df[colonna] <= a).to_numpy()
+    posizioni = np.flatnonzero(maschera)
+
+    # Si ordina solo la colonna scelta delle righe filtrate, poi si prende la pagina
+    if ordina_per:
+        chiavi = pd.Series(df[ordina_per].to_numpy()[posizioni], index=posizioni)
+        posizioni = chiavi.sort_values(ascending=crescente, kind="stable").index.to_numpy()
+    return df.iloc[posizioni[inizio:inizio + righe_per_pagina]], len(posizioni)
+
+
+class _Lavoro:
+    __slots__ = ("tipo", "versione", "df", "righe", "futuro")
+
+    def __init__(self, tipo, versione, df, righe=None):
+        self.tipo = tipo  # "aggiunte" (solo ``righe`` da accodare) o "riscrittura" (tutta ``df``)
+        self.versione = versione
+        self.df = df  # tabella completa a questa versione
+        self.righe = righe
+        self.futuro = Future()
+
+
+class _Scrittore:
+    """Unico thread che scrive una tabella nell'archivio.
+
+    Le modifiche arrivano in coda già applicate in memoria, in ordine di versione; quelle
+    accumulate mentre si scriveva diventano una sola scrittura: un'unica riscrittura della
+    versione più recente, oppure un unico accodamento al giornale se sono solo aggiunte.
+    """
+
+    def __init__(self, nome, righe_giornale):
+        self.nome = nome
+        self.righe_giornale = righe_giornale
+        self.coda = queue.Queue()
+        threading.Thread(target=self._lavora, name=f"scrittore-{nome}", daemon=True).start()
+
+    def _lavora(self):
+        while True:
+            lavori = [self.coda.get()]
+            while not self.coda.empty():
+                lavori.append(self.coda.get_nowait())
+            try:
+                self._scrivi(lavori)
+            except Exception as errore:
+                _log.exception("Scrittura della tabella '%s' non riuscita", self.nome)
+                _scritti(self.nome, lavori, riuscita=False)
+                for lavoro in lavori:
+                    lavoro.futuro.set_exception(errore)
+            else:
+                _scritti(self.nome, lavori, riuscita=True)
+                for lavoro in lavori:
+                    lavoro.futuro.set_result(lavoro.versione)
+            finally:
+                for _ in lavori:
+                    self.coda.task_done()
+
+    def _scrivi(self, lavori):
+        ultimo = lavori[-1]
+        if all(lavoro.tipo == "aggiunte" for lavoro in lavori):
+            righe = pd.concat([lavoro.righe for lavoro in lavori], ignore_index=True)
+            self.righe_giornale += _archivio.accoda(self.nome, righe)
+            if self.righe_giornale < SOGLIA_COMPATTAZIONE:
+                return
+        # La versione più recente contiene già tutte le modifiche precedenti
+        _archivio.scrivi(self.nome, ultimo.df)
+        self.righe_giornale = 0
+
+
+def _in_scrittura(nome, tipo, voce, righe=None):
+    # Da chiamare con il lock della tabella: l'ordine della coda è quello delle versioni
+    scrittore = _scrittori.get(nome)
+    if scrittore is None:
+        scrittore = _scrittori[nome] = _Scrittore(nome, _cache[nome].righe_giornale if nome in _cache else 0)
+    lavoro = _Lavoro(tipo, voce.versione, voce.df, righe)
+    _in_coda[nome] = _in_coda.get(nome, 0) + 1
+    scrittore.coda.put(lavoro)
+    scritture = getattr(_letture, "scritture", None)
+    if scritture is not None:
+        scritture.append(lavoro.futuro)
+    return lavoro.futuro
+
+
+def _scritti(nome, lavori, riuscita):
+    with _lock[nome]:
+        _in_coda[nome] -= len(lavori)
+        voce = _cache[nome]
+        if _in_coda[nome] or voce.versione != lavori[-1].versione:
+            return
+        # Memoria e archivio di nuovo allineati: la voce prende la firma attuale. Se la scrittura
+        # è fallita, una firma nulla fa rileggere la tabella dall'archivio alla prossima lettura.
+        allineata = _Voce(_archivio.firma(nome) if riuscita else None, voce.df, voce.versione)
+        allineata.gruppi, allineata.ordinamenti = voce.gruppi, voce.ordinamenti
+        _pubblica(nome, allineata)
+
+
+def _nuova_versione(nome, calcola):
+    """Pubblica la versione calcolata da ``calcola(voce) -> (df, tipo, righe)`` e la mette in coda.
+
+    ``tipo`` è quello del registro ("aggiunte", "eliminate" o "riscrittura"). Il lavoro su tutta
+    la tabella si fa fuori dal lock; sotto il lock si controlla solo che nel frattempo non sia
+    arrivata un'altra modifica, nel qual caso si ricalcola sull'ultima versione.
+    """
+    while True:
+        voce = _voce_aggiornata(nome)
+        df, tipo, righe = calcola(voce)
+        with _lock[nome]:
+            if _cache[nome].versione != voce.versione:
+                continue
+            voce = _Voce(voce.firma, df, voce.versione + 1)
+            if tipo == "aggiunte":
+                futuro = _in_scrittura(nome, "aggiunte", voce, righe)
+            else:
+                futuro = _in_scrittura(nome, "riscrittura", voce)
+            _pubblica(nome, voce)
+            _registra(nome, voce.versione, tipo, righe)
+            return df, futuro
+
+
+def modifica(nome, funzione):
+    """Applica ``funzione(tabella) -> nuova tabella`` all'ultima versione e la salva in background.
+
+    Due salvataggi contemporanei non si sovrascrivono: se un'altra modifica arriva mentre
+    ``funzione`` gira, la si richiama sulla versione nuova (quindi non deve avere effetti
+    collaterali). La nuova versione è subito visibile a tutti; la scrittura su disco avviene
+    nel thread della tabella. Restituisce un ``Future`` che si completa a scrittura avvenuta.
+    """
+    def calcola(voce):
+        df = _prepara(nome, funzione(voce.df.copy(deep=False)).reset_index(drop=True))
+        return df, "riscrittura", None
+
+    return _nuova_versione(nome, calcola)[1]
+
+
+def salva(nome, df):
+    """Sostituisce tutta la tabella con ``df`` (vedi ``modifica``, da preferire per non perdere modifiche altrui)."""
+    return modifica(nome, lambda _: df)
+
+
+def _come_su_disco(nome, df, righe):
+    """Righe nuove con le colonne e i tipi che avrebbero rilette dal disco insieme a ``df``."""
+    righe = pd.DataFrame(righe).reindex(columns=per_disco(nome, df.iloc[:0]).columns)
+    # Dove la tabella ha testo anche i numeri tornano dal file come testo ("90.0", non 90.0)
+    testo = [colonna for colonna in righe.columns if df[colonna].dtype == object and df[colonna].notna().any()]
+    return righe.assign(**{colonna: righe[colonna].map(str, na_action="ignore") for colonna in testo})
+
+
+def _accoda(df, nuove):
+    """``df`` seguita da ``nuove`` (già preparate), senza ripreparare la tabella esistente."""
+    # Categorie unite prima di concatenare, altrimenti pandas ripiega su object
+    for colonna in df.select_dtypes(include="category").columns:
+        mancanti = nuove[colonna].cat.categories.difference(df[colonna].cat.categories)
+        if len(mancanti):
+            df = df.assign(**{colonna: df[colonna].cat.add_categories(mancanti)})
+        nuove = nuove.assign(**{colonna: nuove[colonna].cat.set_categories(df[colonna].cat.categories)})
+    # Colonne tutte vuote nelle righe nuove: stesso tipo della tabella (niente FutureWarning di concat)
+    nuove = nuove.astype({colonna: df[colonna].dtype for colonna in nuove.columns
+                          if colonna in df.columns and nuove[colonna].isna().all() and nuove[colonna].dtype != df[colonna].dtype})
+    return pd.concat([df, nuove], ignore_index=True)
+
+
+def aggiungi(nome, righe):
+    """Accoda nuove righe alla tabella, senza riscriverla tutta.
+
+    Con i CSV le righe finiscono in un giornale, riversato nel CSV principale ogni
+    ``SOGLIA_COMPATTAZIONE`` righe. La scrittura avviene in background; restituisce
+    subito la tabella aggiornata.
+    """
+    def calcola(voce):
+        nuove = _prepara(nome, _come_su_disco(nome, voce.df, righe))
+        df = _accoda(voce.df, nuove)
+        return df, "aggiunte", df.iloc[len(voce.df):]
+
+    return _nuova_versione(nome, calcola)[0].copy(deep=False)
+
+
+def elimina(nome, etichette):
+    """Elimina le righe indicate (etichette dell'indice) e restituisce la tabella aggiornata.
+
+    ``etichette`` può essere anche una funzione che le ricava dall'ultima versione della tabella
+    (es. tutti i test di un atleta), così non si eliminano righe spostate da altre modifiche.
+    """
+    def calcola(voce):
+        da_eliminare = etichette(voce.df) if callable(etichette) else etichette
+        # Etichette rinumerate come dopo una rilettura (e come i rowid di SQLite)
+        return voce.df.drop(index=da_eliminare).reset_index(drop=True), "eliminate", voce.df.loc[da_eliminare]
+
+    return _nuova_versione(nome, calcola)[0].copy(deep=False)
+
+
+def compatta(nome):
+    """Riversa il giornale degli inserimenti nel CSV principale (il contenuto non cambia).
+
+    Restituisce il ``Future`` della scrittura.
+    """
+    with _lock[nome]:
+        voce = _voce_aggiornata(nome)
+        scrittore = _scrittori.get(nome)
+        if (scrittore.righe_giornale if scrittore is not None else voce.righe_giornale) == 0:
+            futuro = Future()
+            futuro.set_result(voce.versione)
+            return futuro
+        return _in_scrittura(nome, "riscrittura", voce)
+
+
+def attendi_scritture():
+    """Aspetta che tutte le scritture in coda siano finite (all'uscita, nei comandi batch)."""
+    for scrittore in list(_scrittori.values()):
+        scrittore.coda.join()
+
+
+atexit.register(attendi_scritture)
+
+
+def scritture_fallite(scritture):
+    """Toglie da ``scritture`` (vedi ``fissa_versioni``) quelle finite e restituisce gli errori di quelle fallite.
+
+    Una scrittura fallita non resta in memoria: la tabella viene riletta dall'archivio, quindi
+    la modifica è persa e chi l'ha fatta va avvisato.
+    """
+    finite = [futuro for futuro in scritture if futuro.done()]
+    for futuro in finite:
+        scritture.remove(futuro)
+    return [futuro.exception() for futuro in finite if futuro.exception() is not None]
+
+
+def firma(nome):
+    """Firma della tabella nell'archivio (cambia a ogni scrittura, anche da un altro processo)."""
+    return _archivio.firma(nome)
+
+
+def versione(nome):
+    """Contatore che cresce a ogni modifica della tabella (utile come chiave di cache)."""
+    return _voce_letta(nome).versione
+
+
+def modifiche_da(nome, versione):
+    """Modifiche alla tabella successive a ``versione``: restituisce (modifiche, versione attuale).
+
+    Ogni modifica è ("aggiunte" | "eliminate", righe). Le modifiche sono None quando non si
+    possono ripercorrere (tabella riscritta per intero o ricaricata da disco): in quel caso
+    chi le chiede deve ricalcolare tutto da capo.
+    """
+    with _lock[nome]:
+        attuale = _voce_aggiornata(nome).versione
+        if versione == attuale:
+            return [], attuale
+        eventi = [evento for evento in _registro.get(nome, ()) if evento[0] > versione]
+        if not eventi or eventi[0][0] != versione + 1 or any(tipo == "riscrittura" for _, tipo, _ in eventi):
+            return None, attuale
+        return [(tipo, righe) for _, tipo, righe in eventi], attuale
+
+
+class StrutturaCondivisa:
+    """Base per le strutture calcolate dalle tabelle e condivise da tutte le sessioni.
+
+    Le sottoclassi indicano in ``TABELLE`` le tabelle da cui dipendono e implementano
+    ``_ricostruisci()``. Se sanno aggiornarsi in modo incrementale indicano anche la tabella
+    in ``INCREMENTALE`` e implementano ``_applica(modifiche)``, con le modifiche di
+    ``modifiche_da``: si ricostruisce da capo solo quando cambia un'altra tabella o le
+    modifiche non si possono ripercorrere. I metodi di lettura usano ``self._lock``.
+
+    Ogni modulo ne tiene una sola istanza, per tutte le sessioni, e la restituisce già
+    allineata dalla sua funzione di accesso (es. ``livelli_correnti()``).
+    """
+
+    TABELLE = ()
+    INCREMENTALE = None
+
+    def __init__(self):
+        self.versioni = None  # {tabella: versione} su cui è allineata, None prima del primo calcolo
+        self._lock = threading.RLock()
+
+    def allinea(self):
+        # Segue sempre l'ultima versione, non quella fissata dalla sessione che la chiede
+        with self._lock, ultime_versioni():
+            versioni = {nome: versione(nome) for nome in self.TABELLE}
+            if versioni == self.versioni:
+                return self
+            modifiche = None
+            if self.versioni is not None and self.INCREMENTALE is not None and all(
+                    versioni[nome] == self.versioni[nome] for nome in self.TABELLE if nome != self.INCREMENTALE):
+                modifiche, versioni[self.INCREMENTALE] = modifiche_da(self.INCREMENTALE, self.versioni[self.INCREMENTALE])
+            if modifiche is None:
+                self._ricostruisci()
+            else:
+                self._applica(modifiche)
+            self.versioni = versioni
+        return self
+
+    def _ricostruisci(self):
+        raise NotImplementedError
+
+    def _applica(self, modifiche):
+        raise NotImplementedError
+
+
+def migra_in_sqlite(percorso_db=PERCORSO_SQLITE):
+    """Copia una volta sola tutte le tabelle CSV (giornali compresi) nel database SQLite."""
+    from archivio_sqlite import ArchivioSqlite
+
+    csv = ArchivioCsv()
+    sqlite = ArchivioSqlite(percorso_db)
+    for nome in TABELLE:
+        df, _ = csv.leggi(nome)
+        sqlite.scrivi(nome, df)
+    return sqlite
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strumenti per l'archivio dati di Fitness Gauge")
+    parser.add_argument("comando", choices=["migra-sqlite", "compatta"])
+    parser.add_argument("--db", default=PERCORSO_SQLITE, help="file SQLite di destinazione")
+    args = parser.parse_args()
+
+    if args.comando == "migra-sqlite":
+        migra_in_sqlite(args.db)
+        print(f"Tabelle migrate in {args.db}. Avvia l'app con FITNESS_ARCHIVIO=sqlite.")
+    else:
+        for nome in TABELLE:
+            compatta(nome)
+        attendi_scritture()
@@ -0,0 +1,73 @@
+import argparse
+
+import pandas as pd
+
+import dati
+import valutazione
+from livelli_correnti import livelli_correnti
+
+# Righe convertite e scritte per volta: il resto della tabella non passa mai in memoria come celle
+BLOCCO = 5000
+
+COLONNE_LIVELLI = ["nome", "esercizio", "tipo_valore", "data", "valore", "livello", "livello_num"]
+
+
+def righe(df, blocco=BLOCCO, trasforma=None):
+    """Generatore delle righe di ``df`` come liste di valori semplici, un blocco alla volta.
+
+    ``trasforma`` (facoltativa) viene applicata a ogni blocco prima della conversione,
+    ad esempio per valutare i test solo quando servono.
+    """
+    for inizio in range(0, len(df), blocco):
+        parte = df.iloc[inizio:inizio + blocco]
+        if trasforma is not None:
+            parte = trasforma(parte)
+        # Celle vuote al posto di NaN/NaT, date come datetime per il formato di Excel
+        parte = parte.astype(object).where(parte.notna(), None)
+        yield from parte.itertuples(index=False, name=None)
+
+
+def _foglio(workbook, titolo, colonne, righe_foglio):
+    foglio = workbook.add_worksheet(titolo)
+    intestazione = workbook.add_format({"bold": True})
+    foglio.write_row(0, 0, colonne, intestazione)
+    foglio.freeze_panes(1, 0)
+    # In constant_memory le righe vanno scritte in ordine e non si possono più modificare
+    for numero, valori in enumerate(righe_foglio, start=1):
+        foglio.write_row(numero, 0, valori)
+
+
+def esporta(destinazione, blocco=BLOCCO):
+    """Scrive lo storico completo in un file XLSX a più fogli (percorso o file aperto in scrittura).
+
+    Usa la modalità ``constant_memory`` di XlsxWriter: ogni riga viene scritta subito su
+    disco, quindi la memoria non cresce con gli anni di dati. I PIN degli utenti non vengono esportati.
+    """
+    import xlsxwriter
+
+    test = dati.carica("test").drop(columns=dati.COLONNE_DERIVATE["test"], errors="ignore")
+    wod_risultati = dati.carica("wod_risultati").drop(columns=dati.COLONNE_DERIVATE["wod_risultati"], errors="ignore")
+    utenti = dati.carica("utenti").drop(columns=["pin"], errors="ignore")
+    livelli = livelli_correnti().tabella()[COLONNE_LIVELLI]
+    indice = valutazione.indice_benchmark()
+    generi = valutazione.generi_atleti()
+
+    def valuta_blocco(parte):
+        # Il genere del profilo serve solo al livello: nel foglio resta quello salvato sul test
+        return parte.assign(livello=valutazione.valuta(valutazione.con_genere(parte, generi), indice)["livello"])
+
+    opzioni = {"constant_memory": True, "default_date_format": "dd/mm/yyyy", "strings_to_numbers": False}
+    with xlsxwriter.Workbook(destinazione, opzioni) as workbook:
+        _foglio(workbook, "Test", [*test.columns, "livello"], righe(test, blocco, valuta_blocco))
+        _foglio(workbook, "Livelli correnti", COLONNE_LIVELLI, righe(livelli, blocco))
+        _foglio(workbook, "WOD risultati", list(wod_risultati.columns), righe(wod_risultati, blocco))
+        _foglio(workbook, "Utenti", list(utenti.columns), righe(utenti, blocco))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Esporta lo storico di Fitness Gauge in Excel")
+    parser.add_argument("destinazione", nargs="?", default=f"storico_{pd.Timestamp.today():%Y-%m-%d}.xlsx")
+    args = parser.parse_args()
+
+    esporta(args.destinazione)
+    print(f"Storico esportato in {args.destinazione}.")
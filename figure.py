@@ -0,0 +1,38 @@
+import threading
+from collections import OrderedDict
+
+import dati
+
+# Quante figure tenere in memoria (per tutte le sessioni) prima di scartare le meno usate
+MAX_FIGURE = 256
+
+_figure = OrderedDict()  # (pagina, atleta, selezione) -> (versioni lette, figura)
+_lock = threading.Lock()
+
+
+def figura(pagina, atleta, selezione, costruisci):
+    """Figura già costruita per questa vista, se i dati da cui dipende non sono cambiati.
+
+    Mentre ``costruisci`` gira si annotano le versioni delle tabelle che legge davvero, fissate
+    dalla sessione o ultime (strutture condivise): la figura vale finché le stesse letture
+    trovano le stesse versioni, quindi le strutture condivise vanno chiamate dentro
+    ``costruisci``. Può restituire anche una tupla (figura, dati mostrati); le viste meno
+    usate escono dalla cache (LRU).
+    """
+    chiave = (pagina, atleta, selezione)
+    with _lock:
+        voce = _figure.get(chiave)
+    if voce is not None and dati.versioni_attuali(voce[0]) == voce[0]:
+        with _lock:
+            if chiave in _figure:
+                _figure.move_to_end(chiave)
+        return voce[1]
+
+    with dati.versioni_lette() as lette:
+        valore = costruisci()
+    with _lock:
+        _figure[chiave] = (lette, valore)
+        _figure.move_to_end(chiave)
+        while len(_figure) > MAX_FIGURE:
+            _figure.popitem(last=False)
+    return valore
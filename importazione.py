@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+import dati
+import valutazione
+from dati import in_secondi
+
+# Colonne attese nel foglio; peso_corporeo e genere, se mancano, vengono presi dall'atleta
+COLONNE_OBBLIGATORIE = ["nome", "esercizio", "valore", "data"]
+
+
+def leggi_foglio(file):
+    """Legge un foglio di risultati da CSV o XLSX (openpyxl)."""
+    nome_file = getattr(file, "name", str(file)).lower()
+    if nome_file.endswith((".xlsx", ".xlsm")):
+        foglio = pd.read_excel(file, engine="openpyxl", dtype=object)
+    else:
+        foglio = pd.read_csv(file, dtype=object)
+    foglio.columns = foglio.columns.astype(str).str.strip().str.lower()
+    return foglio
+
+
+def prepara(foglio, esercizi_df, utenti_df):
+    """Valida, normalizza e valuta tutte le righe del foglio in un colpo solo.
+
+    Restituisce ``(test, scartate)``: ``test`` ha le colonne della tabella dei test più
+    ``livello``; ``scartate`` sono le righe rifiutate con il motivo in ``errore``.
+    """
+    mancanti = [colonna for colonna in COLONNE_OBBLIGATORIE if colonna not in foglio]
+    if mancanti:
+        raise ValueError(f"Colonne mancanti nel foglio: {', '.join(mancanti)}")
+
+    foglio = foglio.reset_index(drop=True)
+    foglio["riga"] = foglio.index + 2  # numero di riga come lo vede chi ha compilato il foglio
+    for colonna in ["nome", "esercizio"]:
+        foglio[colonna] = foglio[colonna].astype("string").str.strip()
+
+    # Tipo di valore dall'elenco esercizi, genere e peso dall'anagrafica
+    tipi = esercizi_df.drop_duplicates("esercizio").set_index("esercizio")["tipo_valore"]
+    atleti = utenti_df.drop_duplicates("nome").set_index("nome")
+    foglio["tipo_valore"] = foglio["esercizio"].map(tipi)
+    genere = foglio["genere"] if "genere" in foglio else pd.Series(np.nan, index=foglio.index, dtype=object)
+    foglio["genere"] = genere.fillna(foglio["nome"].map(atleti["genere"]))
+    peso = pd.to_numeric(foglio["peso_corporeo"], errors="coerce") if "peso_corporeo" in foglio else np.nan
+    foglio["peso_corporeo"] = pd.Series(peso, index=foglio.index).fillna(pd.to_numeric(foglio["nome"].map(atleti["peso"]), errors="coerce"))
+
+    # "mm:ss" e numeri in secondi/float; date ISO, gg/mm/aaaa o come le salva Excel
+    numerico = in_secondi(foglio["valore"])
+    data = pd.to_datetime(foglio["data"], format="ISO8601", errors="coerce")
+    foglio["data"] = data.fillna(pd.to_datetime(foglio["data"], format="%d/%m/%Y", errors="coerce"))
+    tempo = foglio["tipo_valore"] == "tempo"
+    kg_rel = foglio["tipo_valore"] == "kg_rel"
+
+    errore = pd.Series(None, index=foglio.index, dtype=object)
+    errore = errore.mask(foglio["data"].isna(), "Data non valida")
+    errore = errore.mask(kg_rel & ~(foglio["peso_corporeo"] > 0), "Peso corporeo mancante")
+    errore = errore.mask(numerico.isna(), "Valore non valido")
+    errore = errore.mask(~foglio["nome"].isin(atleti.index), "Atleta sconosciuto")
+    errore = errore.mask(foglio["tipo_valore"].isna(), "Esercizio sconosciuto")
+    scartate = foglio[errore.notna()].assign(errore=errore[errore.notna()])
+
+    validi = errore.isna()
+    foglio, numerico, tempo, kg_rel = foglio[validi], numerico[validi], tempo[validi], kg_rel[validi]
+    secondi = numerico.round().astype("Int64")
+    testo_tempo = (secondi // 60).astype(str).str.zfill(2) + ":" + (secondi % 60).astype(str).str.zfill(2)
+    test = pd.DataFrame({
+        "nome": foglio["nome"].astype(object),
+        "esercizio": foglio["esercizio"].astype(object),
+        "valore": testo_tempo.astype(object).where(tempo, numerico),
+        "tipo_valore": foglio["tipo_valore"],
+        "peso_corporeo": foglio["peso_corporeo"],
+        "relativo": (numerico / foglio["peso_corporeo"]).round(2).where(kg_rel),
+        "data": foglio["data"].dt.normalize(),
+        "genere": foglio["genere"],
+    })
+    test = valutazione.valuta(test)
+    return test.drop(columns=["valore_norm"]), scartate
+
+
+def colonne_griglia(esercizi):
+    """Colonne della griglia di inserimento: una per esercizio, minuti e secondi per quelli a tempo."""
+    colonne = []
+    for esercizio, tipo in zip(esercizi["esercizio"], esercizi["tipo_valore"]):
+        colonne += [f"{esercizio} (min)", f"{esercizio} (sec)"] if tipo == "tempo" else [esercizio]
+    return colonne
+
+
+def foglio_da_griglia(griglia, esercizi, data):
+    """Da griglia (un atleta per riga, un esercizio per colonna) a foglio lungo per ``prepara``.
+
+    Le celle vuote non diventano test; per il tempo minuti e secondi vengono sommati in secondi.
+    """
+    parti = []
+    for esercizio, tipo in zip(esercizi["esercizio"], esercizi["tipo_valore"]):
+        if tipo == "tempo":
+            minuti = pd.to_numeric(griglia[f"{esercizio} (min)"], errors="coerce")
+            secondi = pd.to_numeric(griglia[f"{esercizio} (sec)"], errors="coerce")
+            compilato = minuti.notna() | secondi.notna()
+            valore = minuti.fillna(0) * 60 + secondi.fillna(0)
+        else:
+            valore = pd.to_numeric(griglia[esercizio], errors="coerce")
+            compilato = valore.notna()
+        parti.append(pd.DataFrame({
+            "nome": griglia["nome"], "esercizio": esercizio, "valore": valore,
+            "peso_corporeo": griglia["peso_corporeo"],
+        })[compilato])
+    foglio = pd.concat(parti, ignore_index=True) if parti else pd.DataFrame(columns=["nome", "esercizio", "valore", "peso_corporeo"])
+    return foglio.assign(data=pd.Timestamp(data))
+
+
+def importa(test):
+    """Accoda in una sola scrittura i test preparati; restituisce la tabella aggiornata."""
+    return dati.aggiungi("test", dati.per_disco("test", test.drop(columns=["livello", "livello_num"])))
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+
+import pandas as pd
+
+import dati
+import valutazione
+
+# Istantanea precalcolata della valutazione, da rigenerare di notte o dopo aver cambiato i benchmark:
+#   python istantanea.py
+CARTELLA = os.path.join(dati.CARTELLA_DATI, "istantanea")
+FILE = {
+    "test": "test_valutati.parquet",  # ogni test con valore_norm, livello e livello_num
+    "livelli": "livelli_correnti.parquet",  # ultimo e penultimo test per (atleta, esercizio)
+    "medie": "medie_categorie.parquet",  # livello medio per (atleta, categoria)
+}
+META = "istantanea.json"
+
+# Tabelle da cui dipende: se una è cambiata dopo la creazione, l'istantanea non vale più
+DIPENDENZE = ["test", "benchmark", "esercizi", "utenti"]
+
+BLOCCO = 50_000
+
+COLONNE_TESTO = ["nome", "esercizio", "valore", "tipo_valore", "genere", "livello"]
+COLONNE_LIVELLI = [
+    "nome", "esercizio", "tipo_valore", "data", "valore", "valore_norm", "livello", "livello_num",
+    "data_precedente", "valore_precedente", "valore_norm_precedente", "livello_num_precedente",
+]
+
+
+def _firma(nome):
+    # Stessa forma che ha dopo il passaggio da JSON (tuple -> liste)
+    return json.loads(json.dumps(dati.firma(nome)))
+
+
+def _scrivi(cartella, nome_file, scrivi):
+    # File temporaneo e rename: un'app che legge non vede mai un file a metà
+    percorso = os.path.join(cartella, nome_file)
+    scrivi(f"{percorso}.tmp")
+    os.replace(f"{percorso}.tmp", percorso)
+
+
+def _livelli(ultimi):
+    """Da (al massimo) gli ultimi due test valutati per coppia alla tabella dei livelli correnti."""
+    ultimi = ultimi.sort_values("data", kind="stable", na_position="first")
+    gruppi = ultimi.groupby(["nome", "esercizio"], sort=True)
+    precedenti = gruppi.nth(-2).set_index(["nome", "esercizio"])
+    livelli = gruppi.tail(1).set_index(["nome", "esercizio"])
+    livelli = livelli.join(precedenti[["data", "valore", "valore_norm", "livello_num"]].add_suffix("_precedente"))
+    livelli["livello_num_precedente"] = livelli["livello_num_precedente"].fillna(0).astype(int)
+    return livelli.reset_index()[COLONNE_LIVELLI]
+
+
+def crea(cartella=CARTELLA, blocco=BLOCCO):
+    """Rivaluta tutti i test a blocchi e scrive l'istantanea in formato Parquet.
+
+    In memoria restano solo il blocco corrente e gli ultimi due test di ogni (atleta, esercizio).
+    Restituisce il numero di test valutati.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(cartella, exist_ok=True)
+    # Firme lette prima dei dati: una scrittura durante il lavoro rende l'istantanea già scaduta
+    firme = {nome: _firma(nome) for nome in DIPENDENZE}
+    indice = valutazione.indice_benchmark()
+    generi = valutazione.generi_atleti()
+
+    schema, writer, ultimi, totale = None, None, None, 0
+    percorso_test = os.path.join(cartella, FILE["test"])
+    try:
+        for parte in dati.leggi_a_blocchi("test", blocco):
+            valutati = valutazione.valuta(valutazione.con_genere(parte, generi), indice)
+            valutati = valutati.astype({colonna: "string" for colonna in COLONNE_TESTO})
+            valutati = valutati.assign(livello_num=valutati["livello_num"].astype("int64")).reset_index(drop=True)
+            if writer is None:
+                schema = pa.Schema.from_pandas(valutati, preserve_index=False)
+                writer = pq.ParquetWriter(f"{percorso_test}.tmp", schema)
+            writer.write_table(pa.Table.from_pandas(valutati, schema=schema, preserve_index=False))
+            totale += len(valutati)
+
+            # Per i livelli correnti basta tenere gli ultimi due test di ogni coppia
+            ultimi = valutati if ultimi is None else pd.concat([ultimi, valutati], ignore_index=True)
+            ultimi = ultimi.sort_values("data", kind="stable", na_position="first").groupby(["nome", "esercizio"]).tail(2)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return 0
+    os.replace(f"{percorso_test}.tmp", percorso_test)
+
+    livelli = _livelli(ultimi)
+    categorie = dati.carica("esercizi").drop_duplicates("esercizio").set_index("esercizio")["categoria"]
+    valutabili = livelli[livelli["livello_num"] > 0].assign(categoria=lambda df: df["esercizio"].map(categorie))
+    medie = (valutabili.groupby(["nome", "categoria"])["livello_num"]
+             .agg(livello_medio="mean", esercizi="size").reset_index())
+    medie["livello_medio"] = medie["livello_medio"].round(2)
+
+    _scrivi(cartella, FILE["livelli"], lambda percorso: livelli.to_parquet(percorso, index=False))
+    _scrivi(cartella, FILE["medie"], lambda percorso: medie.to_parquet(percorso, index=False))
+    meta = {"creata": pd.Timestamp.now().isoformat(timespec="seconds"), "test": totale, "firme": firme}
+
+    def scrivi_meta(percorso):
+        with open(percorso, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    _scrivi(cartella, META, scrivi_meta)
+    return totale
+
+
+def aggiornata(cartella=CARTELLA):
+    """True se l'istantanea esiste ed è stata creata sui dati attuali."""
+    try:
+        with open(os.path.join(cartella, META), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    return all(meta["firme"].get(nome) == _firma(nome) for nome in DIPENDENZE)
+
+
+def leggi(parte, cartella=CARTELLA):
+    """Una parte dell'istantanea ("test", "livelli" o "medie"), oppure None se manca o è scaduta."""
+    if not aggiornata(cartella):
+        return None
+    df = pd.read_parquet(os.path.join(cartella, FILE[parte]))
+    # Testo come nel resto dell'app: object con None per i mancanti (non pd.NA)
+    testo = df.select_dtypes(include="string").columns
+    return df.assign(**{colonna: df[colonna].astype(object).where(df[colonna].notna(), None) for colonna in testo})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rivaluta tutti i test e salva l'istantanea per l'avvio dell'app")
+    parser.add_argument("--cartella", default=CARTELLA, help="cartella di destinazione")
+    parser.add_argument("--blocco", type=int, default=BLOCCO, help="righe lette e valutate per volta")
+    args = parser.parse_args()
+
+    totale = crea(args.cartella, args.blocco)
+    print(f"Istantanea di {totale} test salvata in {args.cartella}.")
@@ -0,0 +1,109 @@
+import pandas as pd
+
+import dati
+import istantanea
+import valutazione
+
+COLONNE = [
+    "esercizio", "tipo_valore", "data", "valore", "valore_norm", "livello", "livello_num",
+    "data_precedente", "valore_precedente", "valore_norm_precedente", "livello_num_precedente",
+]
+
+
+def _record(ultimo, precedente=None):
+    record = {colonna: ultimo[colonna] for colonna in COLONNE[:7]}
+    record["data_precedente"] = precedente["data"] if precedente is not None else pd.NaT
+    record["valore_precedente"] = precedente["valore"] if precedente is not None else None
+    record["valore_norm_precedente"] = precedente["valore_norm"] if precedente is not None else float("nan")
+    record["livello_num_precedente"] = precedente["livello_num"] if precedente is not None else 0
+    return record
+
+
+class LivelliCorrenti(dati.StrutturaCondivisa):
+    """Tabella materializzata (atleta, esercizio) -> ultimo valore, livello, data e valore precedente.
+
+    Gli utenti servono per il genere dei test salvati senza.
+    """
+
+    TABELLE = ("test", "benchmark", "utenti")
+    INCREMENTALE = "test"
+
+    def __init__(self):
+        super().__init__()
+        self._per_atleta = {}  # nome -> {esercizio: record}
+
+    def _applica(self, modifiche):
+        chiavi = set()
+        for _, righe in modifiche:
+            chiavi.update(zip(righe["nome"], righe["esercizio"]))
+        self._ricalcola(chiavi)
+
+    def _ricostruisci(self):
+        # Al primo avvio si parte dall'istantanea precalcolata, se è ancora valida
+        if self.versioni is None:
+            livelli = istantanea.leggi("livelli")
+            if livelli is not None:
+                per_atleta = {}
+                for record in livelli.to_dict("records"):
+                    per_atleta.setdefault(record.pop("nome"), {})[record["esercizio"]] = record
+                self._per_atleta = per_atleta
+                return
+
+        # I test senza una data valida vanno in testa: non contano mai come l'ultimo
+        test = dati.carica("test").sort_values("data", kind="stable", na_position="first")
+        test = valutazione.con_genere(test, valutazione.generi_atleti())
+        gruppi = test.groupby(["nome", "esercizio"], observed=True, sort=False)
+        ultimi = valutazione.valuta(gruppi.tail(1))
+        precedenti = valutazione.valuta(gruppi.nth(-2)).set_index(["nome", "esercizio"])
+
+        per_atleta = {}
+        for ultimo in ultimi.to_dict("records"):
+            chiave = (ultimo["nome"], ultimo["esercizio"])
+            precedente = precedenti.loc[chiave].to_dict() if chiave in precedenti.index else None
+            per_atleta.setdefault(ultimo["nome"], {})[ultimo["esercizio"]] = _record(ultimo, precedente)
+        self._per_atleta = per_atleta
+
+    def _ricalcola(self, chiavi):
+        # Ricalcola solo le coppie toccate, leggendo i test del singolo atleta
+        per_nome = {}
+        for nome, esercizio in chiavi:
+            per_nome.setdefault(nome, set()).add(esercizio)
+
+        generi = valutazione.generi_atleti()
+        for nome, esercizi in per_nome.items():
+            test_atleta = valutazione.con_genere(dati.filtra("test", "nome", nome), generi)
+            righe = self._per_atleta.setdefault(nome, {})
+            for esercizio in esercizi:
+                storico = test_atleta[test_atleta["esercizio"] == esercizio].sort_values("data", kind="stable", na_position="first")
+                if storico.empty:
+                    righe.pop(esercizio, None)
+                    continue
+                ultimi = valutazione.valuta(storico.tail(2)).to_dict("records")
+                righe[esercizio] = _record(ultimi[-1], ultimi[0] if len(ultimi) > 1 else None)
+            if not righe:
+                del self._per_atleta[nome]
+
+    def atleta(self, nome):
+        """Livelli correnti di un atleta, una riga per esercizio."""
+        with self._lock:
+            righe = list(self._per_atleta.get(nome, {}).values())
+        return pd.DataFrame(righe, columns=COLONNE)
+
+    def ultimo(self, nome, esercizio):
+        """Record dell'ultimo test di un atleta su un esercizio, oppure None."""
+        with self._lock:
+            return self._per_atleta.get(nome, {}).get(esercizio)
+
+    def tabella(self):
+        """Tutti gli atleti: una riga per (nome, esercizio)."""
+        with self._lock:
+            righe = [dict(record, nome=nome) for nome, esercizi in self._per_atleta.items() for record in esercizi.values()]
+        return pd.DataFrame(righe, columns=["nome"] + COLONNE)
+
+
+_livelli = LivelliCorrenti()
+
+
+def livelli_correnti():
+    """Livelli correnti di tutti gli atleti."""
+    return _livelli.allinea()
@@ -0,0 +1,145 @@
+import datetime
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import dati
+import valutazione
+from livelli_correnti import livelli_correnti
+
+CATEGORIE = ["forza", "ginnastica", "metabolico"]
+
+
+def contenuti_pagelle(nomi=None):
+    """Dati di tutte le pagelle, ricavati da un'unica tabella già valutata (livelli correnti).
+
+    Restituisce {nome: contenuto} con soli tipi semplici, così i processi che generano
+    i PDF non devono rifare né la lettura né la valutazione dei test.
+    """
+    utenti_df = dati.carica("utenti")
+    esercizi_df = dati.carica("esercizi").drop_duplicates("esercizio")
+    indice = valutazione.indice_benchmark()
+
+    correnti = livelli_correnti().tabella()
+    if nomi is not None:
+        correnti = correnti[correnti["nome"].isin(nomi)]
+    correnti = correnti.merge(esercizi_df[["esercizio", "categoria"]], on="esercizio", how="left")
+    generi = utenti_df.drop_duplicates("nome").set_index("nome")["genere"]
+    correnti["genere"] = correnti["nome"].map(generi)
+
+    # Miglioramento sul test precedente (per il tempo meno è meglio)
+    attuale, precedente = correnti["valore_norm"], correnti["valore_norm_precedente"]
+    delta = np.where(correnti["tipo_valore"] == "tempo", precedente - attuale, attuale - precedente)
+    correnti["miglioramento"] = (delta / precedente.where(precedente > 0) * 100).round(1)
+
+    contenuti = {}
+    for nome, righe in correnti.groupby("nome", sort=True):
+        valutati = righe[righe["livello_num"] > 0]
+        aree = valutati.groupby("categoria")["livello_num"].mean().round(2)
+        esercizi = []
+        for riga in righe.sort_values(["categoria", "esercizio"]).itertuples(index=False):
+            prossimo, target = indice.prossimo_livello(riga.esercizio, riga.genere, riga.livello_num)
+            esercizi.append({
+                "esercizio": riga.esercizio,
+                "categoria": riga.categoria,
+                "valore": str(riga.valore),
+                "livello": riga.livello,
+                "data": "" if pd.isna(riga.data) else riga.data.strftime("%d/%m/%Y"),
+                "miglioramento": None if np.isnan(riga.miglioramento) else float(riga.miglioramento),
+                "prossimo": f"{prossimo.capitalize()} ({target})" if prossimo else "",
+            })
+        contenuti[nome] = {
+            "nome": nome,
+            "aree": {categoria: float(aree[categoria]) for categoria in CATEGORIE if categoria in aree},
+            "esercizi": esercizi,
+        }
+    return contenuti
+
+
+def _testo(valore):
+    # fpdf 1.7 scrive solo latin-1
+    return str(valore).encode("latin-1", "replace").decode("latin-1")
+
+
+def _radar(aree, percorso):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    etichette = [categoria.capitalize() for categoria in aree]
+    valori = list(aree.values())
+    angoli = np.linspace(0, 2 * np.pi, len(valori), endpoint=False).tolist()
+    fig, ax = plt.subplots(figsize=(3.2, 3.2), subplot_kw={"polar": True})
+    ax.fill(angoli + angoli[:1], valori + valori[:1], color="#007bff", alpha=0.35)
+    ax.plot(angoli + angoli[:1], valori + valori[:1], color="#007bff")
+    ax.set_xticks(angoli)
+    ax.set_xticklabels(etichette)
+    ax.set_ylim(0, 5)
+    fig.savefig(percorso, dpi=120, bbox_inches="tight")
+    plt.close(fig)
+
+
+def genera_pagella(contenuto):
+    """PDF di un atleta (bytes). Gira in un processo separato."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, _testo(f"Pagella - {contenuto['nome']}"), ln=1)
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(0, 6, _testo(f"Generata il {datetime.date.today().strftime('%d/%m/%Y')}"), ln=1)
+    pdf.ln(4)
+
+    # Livello medio per area, con il radar se ci sono almeno tre aree
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, "Livello medio per area", ln=1)
+    pdf.set_font("Arial", "", 10)
+    for categoria, media in contenuto["aree"].items():
+        pdf.cell(0, 6, _testo(f"{categoria.capitalize()}: {media}/5"), ln=1)
+    if len(contenuto["aree"]) >= 3:
+        with tempfile.TemporaryDirectory() as cartella:
+            percorso = os.path.join(cartella, "radar.png")
+            _radar(contenuto["aree"], percorso)
+            pdf.image(percorso, x=130, y=20, w=65)
+    pdf.set_y(max(pdf.get_y(), 90))
+
+    # Ultimo test per esercizio
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, "Ultimi test", ln=1)
+    colonne = [("Esercizio", 50), ("Data", 22), ("Valore", 22), ("Livello", 25), ("Miglioramento", 28), ("Prossimo obiettivo", 43)]
+    pdf.set_font("Arial", "B", 9)
+    for titolo, larghezza in colonne:
+        pdf.cell(larghezza, 7, titolo, border=1)
+    pdf.ln()
+    pdf.set_font("Arial", "", 9)
+    for esercizio in contenuto["esercizi"]:
+        miglioramento = esercizio["miglioramento"]
+        valori = [
+            esercizio["esercizio"], esercizio["data"], esercizio["valore"], esercizio["livello"],
+            "" if miglioramento is None else f"{miglioramento:+.1f}%", esercizio["prossimo"],
+        ]
+        for (_, larghezza), valore in zip(colonne, valori):
+            pdf.cell(larghezza, 6, _testo(valore), border=1)
+        pdf.ln()
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def genera_pagelle(contenuti, progresso=None, processi=None):
+    """Genera i PDF in parallelo su un pool di processi: restituisce {nome: bytes}.
+
+    ``progresso(fatte, totali)`` viene chiamata a ogni pagella completata.
+    """
+    pagelle = {}
+    if not contenuti:
+        return pagelle
+    with ProcessPoolExecutor(max_workers=processi) as pool:
+        futuri = {pool.submit(genera_pagella, contenuto): nome for nome, contenuto in contenuti.items()}
+        for fatte, futuro in enumerate(as_completed(futuri), start=1):
+            pagelle[futuri[futuro]] = futuro.result()
+            if progresso is not None:
+                progresso(fatte, len(futuri))
+    return pagelle
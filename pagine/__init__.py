@@ -0,0 +1,50 @@
+import importlib
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import dati
+
+# Voce della barra laterale -> (modulo in pagine/, ruoli che la vedono).
+# Il modulo viene importato solo la prima volta che la pagina è aperta (plotly compreso).
+PAGINE = {
+    "🏠 Dashboard": ("dashboard", ("coach", "atleta")),
+    "📅 Calendario WOD": ("calendario_wod", ("coach", "atleta")),
+    "➕ Inserisci nuovo test": ("inserisci_test", ("coach", "atleta")),
+    "👤 Profilo Atleta": ("profilo_atleta", ("coach", "atleta")),
+    "⚙️ Gestione Esercizi": ("gestione_esercizi", ("coach",)),
+    "📋 Storico Dati Utenti": ("storico_dati_utenti", ("coach",)),
+    "📊 Bilanciamento Atleti": ("bilanciamento", ("coach",)),
+    "➕ Aggiungi Utente": ("aggiungi_utente", ("coach",)),
+    "⚙️ Gestione Benchmark": ("gestione_benchmark", ("coach",)),
+    "📊 Grafici": ("grafici", ("coach", "atleta")),
+    "📜 Storico Test": ("storico_test", ("atleta",)),
+    "📈 Storico Progressi": ("storico_progressi", ("coach", "atleta")),
+    "📒 WOD": ("wod", ("coach", "atleta")),
+    "🏆 Classifiche": ("classifica", ("coach",)),
+    "📄 Pagelle": ("pagelle", ("coach",)),
+    "⏰ Test da ripetere": ("test_da_ripetere", ("coach",)),
+}
+
+
+def pagine_per_ruolo(ruolo):
+    return [pagina for pagina, (_, ruoli) in PAGINE.items() if ruolo in ruoli]
+
+
+def fissa_versioni_frammento():
+    """Da chiamare all'inizio di un frammento: fissa le versioni solo se il frammento è rieseguito da solo.
+
+    In un'esecuzione completa le ha già fissate ssg.py; fissarle di nuovo a metà pagina
+    farebbe leggere alla parte restante versioni diverse da quelle già mostrate.
+    """
+    contesto = get_script_run_ctx()
+    if contesto is not None and contesto.fragment_ids_this_run:
+        dati.fissa_versioni(st.session_state.setdefault("scritture", []))
+
+
+def mostra(pagina, utente):
+    """Importa (una volta sola per processo) il modulo della pagina e la disegna."""
+    modulo, ruoli = PAGINE[pagina]
+    if utente["ruolo"] not in ruoli:
+        return
+    importlib.import_module(f"pagine.{modulo}").mostra(utente)
@@ -0,0 +1,74 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+import dati
+import pagine
+
+
+# Pagina: Aggiungi Utente (solo per coach)
+def mostra(utente):
+    st.subheader("➕ Aggiungi un nuovo utente")
+    _gestione_utenti(utente)
+
+
+# Frammento: modificare un campo riesegue solo questa parte, non tutto lo script
+@st.fragment
+def _gestione_utenti(utente):
+    pagine.fissa_versioni_frammento()
+    utenti_df = dati.carica("utenti")
+
+    # Mostra tutti gli utenti esistenti
+    st.write("### Utenti esistenti:")
+    st.dataframe(utenti_df)
+
+    # Mostra solo i coach esistenti
+    st.write("### Coach esistenti:")
+    coach_df = utenti_df[utenti_df["ruolo"] == "coach"]
+    st.dataframe(coach_df)
+
+    # Seleziona un utente da eliminare
+    st.write("### Elimina un utente:")
+    utente_da_eliminare = st.selectbox("Seleziona un utente da eliminare", utenti_df["nome"].unique(), key="elimina_utente")
+
+    if st.button("Elimina utente", key="elimina_utente_button"):
+        # Elimina l'utente dal DataFrame degli utenti
+        dati.modifica("utenti", lambda df: df[df["nome"] != utente_da_eliminare])
+
+        # Elimina i dati dell'utente dal DataFrame dei test (righe cercate nell'ultima versione)
+        dati.elimina("test", lambda df: df.index[df["nome"] == utente_da_eliminare])
+
+        st.success(f"Utente '{utente_da_eliminare}' e i suoi dati sono stati eliminati con successo!")
+
+    # Input per i dettagli del nuovo utente (coach o atleta)
+    st.write("### Aggiungi un nuovo utente:")
+    nuovo_nome = st.text_input("Nome utente")
+    nuovo_pin = st.text_input("PIN utente", type="password")
+    nuovo_ruolo = st.selectbox("Ruolo", ["atleta", "coach"], key="aggiungi_ruolo")
+    nuovo_peso = st.number_input("Peso corporeo (kg)", min_value=30.0, max_value=200.0, step=0.1, key="aggiungi_peso")
+    nuova_data_nascita = st.date_input(
+        "Data di nascita",
+        value=datetime.date(2000, 1, 1),
+        min_value=datetime.date(1960, 1, 1),
+        key="aggiungi_data_nascita"
+    )
+    nuovo_genere = st.selectbox("Genere", ["Maschio", "Femmina", "Altro"], key="aggiungi_genere_utente")
+
+    if st.button("Aggiungi utente", key="aggiungi_utente_button"):
+        # Il nome identifica l'utente in tutta l'app (test, profilo, login): niente omonimi
+        if nuovo_nome.strip() in set(utenti_df["nome"].astype(str).str.strip()):
+            st.error(f"Esiste già un utente di nome '{nuovo_nome.strip()}': scegli un nome diverso.")
+        elif nuovo_nome and nuovo_pin:
+            nuovo_utente = {
+                "nome": nuovo_nome.strip(),
+                "pin": nuovo_pin,
+                "ruolo": nuovo_ruolo,
+                "peso": nuovo_peso,
+                "data_nascita": nuova_data_nascita.strftime("%Y-%m-%d"),
+                "genere": nuovo_genere
+            }
+            dati.modifica("utenti", lambda df: pd.concat([df, pd.DataFrame([nuovo_utente])], ignore_index=True))
+            st.success(f"Nuovo utente '{nuovo_nome}' aggiunto con successo come {nuovo_ruolo}!")
+        else:
+            st.error("Compila tutti i campi richiesti.")
@@ -0,0 +1,81 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import dati
+from aree import matrice_aree
+from figure import figura
+
+
+# Pagina: Aree di Performance
+def mostra(utente):
+    st.subheader("📊 Aree di Performance")
+
+    # Livelli 1-5 sui benchmark per atleta e categoria (matrice condivisa, aggiornata a ogni test)
+    matrice = matrice_aree().matrice()
+    if matrice.empty:
+        st.info("Non ci sono dati sufficienti per generare il grafico radar.")
+    else:
+        st.write("### Livello medio della squadra")
+        st.plotly_chart(figura("bilanciamento", None, "radar", lambda: _radar_squadra(matrice_aree().matrice())),
+                        use_container_width=True)
+
+        st.write("### Aree deboli per atleta")
+        st.plotly_chart(figura("bilanciamento", None, "heatmap", lambda: _heatmap(matrice_aree().matrice())),
+                        use_container_width=True)
+
+        # Tabella ordinabile cliccando sulle intestazioni
+        tabella = matrice.rename(columns=str.capitalize).assign(**{
+            "Media": matrice.mean(axis=1).round(2),
+            "Area più debole": matrice.idxmin(axis=1).str.capitalize(),
+        })
+        st.dataframe(tabella, use_container_width=True)
+
+    # Grafico a barre per il bilanciamento di genere
+    st.subheader("📊 Distribuzione per Genere")
+    fig_genere = figura("bilanciamento", None, "genere", _barre_genere)
+    st.plotly_chart(fig_genere, use_container_width=True)
+
+
+def _radar_squadra(matrice):
+    medie = matrice.mean().round(2)
+    fig = go.Figure(data=go.Scatterpolar(
+        r=medie.to_numpy(),
+        theta=[categoria.capitalize() for categoria in medie.index],
+        fill='toself'
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 5])),
+        showlegend=False
+    )
+    return fig
+
+
+def _heatmap(matrice):
+    fig = go.Figure(data=go.Heatmap(
+        z=matrice.to_numpy(),
+        x=[categoria.capitalize() for categoria in matrice.columns],
+        y=matrice.index,
+        zmin=1, zmax=5,
+        colorscale="RdYlGn",
+        text=matrice.to_numpy(),
+        texttemplate="%{text}",
+        hovertemplate="%{y} - %{x}: livello %{z}<extra></extra>",
+    ))
+    fig.update_layout(height=max(300, 40 * len(matrice) + 120), yaxis=dict(autorange="reversed"))
+    return fig
+
+
+def _barre_genere():
+    genere_counts = dati.carica("utenti")['genere'].value_counts()
+    fig_genere = go.Figure(data=go.Bar(
+        x=genere_counts.index,
+        y=genere_counts.values,
+        text=genere_counts.values,
+        textposition='auto'
+    ))
+    fig_genere.update_layout(
+        xaxis_title="Genere",
+        yaxis_title="Numero di Utenti",
+        title="Distribuzione degli Utenti per Genere"
+    )
+    return fig_genere
@@ -0,0 +1,101 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+import dati
+
+
+# Pagina: Calendario WOD
+def mostra(utente):
+    wod_df = dati.carica("wod")
+
+    st.subheader("📅 Calendario WOD (Workout Of the Day)")
+
+    # Seleziona una data
+    data_selezionata = st.date_input("Seleziona una data", value=datetime.date.today(), key="wod_date")
+    data_str = data_selezionata.strftime("%Y-%m-%d")
+    giorno = pd.Timestamp(data_selezionata)
+    wod_giorno = dati.intervallo("wod", "data", giorno, giorno + pd.Timedelta(days=1))
+
+    if not wod_giorno.empty:
+        st.write(f"### WOD del {data_str}")
+        st.write(f"**Nome:** {wod_giorno.iloc[0]['titolo']}")
+        st.write(f"**Descrizione:** {wod_giorno.iloc[0]['descrizione']}")
+    else:
+        st.info("Nessun WOD pubblicato per questa data.")
+
+    # Solo i coach possono aggiungere/modificare/eliminare WOD
+    if utente['ruolo'] == 'coach':
+        st.write("---")
+        st.write("### Pubblica o modifica WOD per questa data")
+        titolo_wod = st.text_input("Titolo WOD", value=wod_giorno.iloc[0]['titolo'] if not wod_giorno.empty else "")
+        descrizione_wod = st.text_area("Descrizione WOD", value=wod_giorno.iloc[0]['descrizione'] if not wod_giorno.empty else "")
+
+        if st.button("Salva/Modifica WOD", key="salva_wod"):
+            # Se esiste già, aggiorna; altrimenti aggiungi (sull'ultima versione della tabella)
+            def salva_wod(df):
+                del_giorno = df["data"] == giorno
+                if del_giorno.any():
+                    df.loc[del_giorno, ["titolo", "descrizione"]] = [titolo_wod, descrizione_wod]
+                    return df
+                nuovo_wod = {"data": giorno, "titolo": titolo_wod, "descrizione": descrizione_wod}
+                return pd.concat([df, pd.DataFrame([nuovo_wod])], ignore_index=True)
+            dati.modifica("wod", salva_wod)
+            st.success("WOD salvato/modificato con successo!")
+
+        if not wod_giorno.empty:
+            if st.button("Elimina WOD", key="elimina_wod"):
+                dati.modifica("wod", lambda df: df[df["data"] != giorno])
+                st.success("WOD eliminato con successo!")
+
+    st.write("---")
+    st.write("### Storico WOD pubblicati")
+    wod_df = dati.carica("wod")
+    if wod_df.empty:
+        st.info("Nessun WOD pubblicato finora.")
+        return
+
+    # Un mese alla volta: si disegnano solo i WOD del mese scelto
+    mesi = wod_df["data"].dt.strftime("%Y-%m").drop_duplicates().sort_values(ascending=False)
+    mese = pd.Period(st.selectbox("Mese", mesi, key="wod_mese"), freq="M")
+    wod_mese = dati.intervallo("wod", "data", mese.start_time, (mese + 1).start_time)
+    wod_mese = wod_mese.iloc[::-1]
+
+    # Verifica che la colonna 'nome' esista, altrimenti usa un valore predefinito
+    nomi_wod = wod_mese["nome"].fillna("WOD") if "nome" in wod_mese else pd.Series("WOD", index=wod_mese.index)
+    st.dataframe(
+        pd.DataFrame({"data": wod_mese["data"].dt.date, "nome": nomi_wod}),
+        hide_index=True, use_container_width=True,
+    )
+
+    etichette = dict(zip(wod_mese["data"].dt.strftime("%Y-%m-%d") + " - " + nomi_wod.astype(str), wod_mese.index))
+    scelto = st.selectbox("Apri un WOD", list(etichette), index=None, placeholder="Scegli un WOD del mese", key="wod_aperto")
+    if scelto is None:
+        return
+    idx = etichette[scelto]
+
+    # Solo il WOD aperto: descrizione, test collegati e nota
+    row = wod_mese.loc[idx]
+    st.markdown(f"#### {row['data'].date()} - {nomi_wod[idx]}")
+    st.markdown(f"**Descrizione:** {row['descrizione']}")
+    esercizi_collegati = row['esercizi'].split(";") if 'esercizi' in row and pd.notnull(row['esercizi']) else []
+    if esercizi_collegati:
+        st.markdown(f"**Esercizi collegati:** {', '.join(esercizi_collegati)}")
+
+    # Mostra test dell’atleta legati al WOD
+    test_atleta = dati.filtra("test", "nome", utente["nome"])
+    test_collegati = test_atleta[test_atleta["esercizio"].isin(esercizi_collegati)]
+    if not test_collegati.empty:
+        st.markdown("📊 **Test collegati a questo WOD:**")
+        st.dataframe(test_collegati[["data", "esercizio", "valore", "tipo_valore"]])
+    else:
+        st.info("Nessun test collegato trovato per questo WOD.")
+
+    # Aggiungi nota personale
+    st.markdown("📝 **Nota personale**")
+    note_key = f"nota_{idx}_{utente['nome']}"
+    st.text_area("Scrivi una nota (visibile solo a te)", key=note_key)
+    if st.button("Salva nota", key=f"salva_{note_key}"):
+        # Salva su CSV o mostra (puoi implementare salvataggio locale più avanti)
+        st.success("Nota salvata! (implementare salvataggio permanente)")
@@ -0,0 +1,38 @@
+import streamlit as st
+
+import dati
+from classifiche import classifiche
+
+
+# Pagina: Classifiche (solo coach)
+def mostra(utente):
+    utenti_df = dati.carica("utenti")
+    esercizi_df = dati.carica("esercizi")
+
+    st.subheader("🏆 Classifiche")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        esercizio_classifica = st.selectbox("Esercizio", esercizi_df["esercizio"].unique(), key="classifica_esercizio")
+    with col2:
+        genere_classifica = st.selectbox("Genere", ["Maschio", "Femmina"], key="classifica_genere")
+    with col3:
+        k = st.number_input("Prime posizioni", min_value=3, max_value=100, value=10, step=1)
+
+    classifiche_gym = classifiche()
+    prime = classifiche_gym.prime(esercizio_classifica, genere_classifica, int(k))
+    if prime.empty:
+        st.info("Nessun risultato registrato per questo esercizio.")
+    else:
+        st.dataframe(prime, hide_index=True, use_container_width=True)
+
+        # Posizione e percentile di un singolo atleta
+        atleti = utenti_df[(utenti_df["ruolo"] == "atleta") & (utenti_df["genere"] == genere_classifica)]["nome"].unique()
+        atleta_classifica = st.selectbox("Posizione di un atleta", atleti, key="classifica_atleta")
+        posizione, percentile, totale = classifiche_gym.posizione(esercizio_classifica, genere_classifica, atleta_classifica)
+        if posizione is None:
+            st.info(f"{atleta_classifica} non ha ancora test per {esercizio_classifica}.")
+        else:
+            col1, col2 = st.columns(2)
+            col1.metric("Posizione", f"{posizione}° su {totale}")
+            col2.metric("Percentile", f"{percentile:.0f}°")
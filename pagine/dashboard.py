@@ -0,0 +1,73 @@
+import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import dati
+from figure import figura
+from livelli_correnti import livelli_correnti
+from richiami import richiami
+
+
+# Pagina: Dashboard iniziale
+def mostra(utente):
+    st.title("🏠 Dashboard Atleta")
+
+    # Debug: Ensure the page is being rendered
+    st.write("DEBUG: Rendering Dashboard Page")
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.image("https://cdn-icons-png.flaticon.com/512/847/847969.png", width=80, caption="Avatar")
+    with col2:
+        st.markdown(f"**👤 Nome:** {utente['nome']}")
+        eta = datetime.date.today().year - pd.to_datetime(utente['data_nascita']).year
+        st.markdown(f"**🎂 Età:** {eta} anni")
+        st.markdown(f"**⚖️ Peso:** {utente['peso']} kg")
+        st.markdown(f"**🏅 Genere:** {utente['genere']}")
+
+    st.divider()
+
+    # Livello medio per area
+    st.subheader("📊 Livello medio per area")
+    test_utente = dati.filtra("test", "nome", utente["nome"]).sort_values("data")
+
+    # Ultimo test per esercizio, già valutato nella tabella dei livelli correnti
+    fig = figura("dashboard", utente["nome"], None,
+                 lambda: _radar_aree(livelli_correnti().atleta(utente["nome"]), dati.carica("esercizi")))
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Test recenti
+    st.subheader("📈 Test recenti")
+    test_recenti = test_utente.sort_values("data", ascending=False).head(5)
+    st.dataframe(test_recenti[["data", "esercizio", "valore"]])
+
+    # Prossimi test consigliati: scadenze già calcolate (intervallo di richiamo per esercizio)
+    st.subheader("⏰ Test da ripetere")
+    scadenze = richiami().atleta(utente["nome"])
+    test_scaduti = scadenze[scadenze["scadenza"] < pd.Timestamp.today().normalize()]
+    if not test_scaduti.empty:
+        st.warning("⚠️ Questi test andrebbero aggiornati:")
+        st.dataframe(test_scaduti[["ultimo_test", "esercizio", "scadenza"]])
+    else:
+        st.success("✅ Nessun test da aggiornare al momento.")
+
+
+def _radar_aree(livelli_atleta, esercizi_df):
+    ultimi_test = livelli_atleta[livelli_atleta["livello_num"] > 0]
+    radar_labels = []
+    radar_values = []
+    for cat in ["forza", "ginnastica", "metabolico"]:
+        esercizi_cat = esercizi_df[esercizi_df["categoria"] == cat]["esercizio"].unique()
+        livelli = ultimi_test.loc[ultimi_test["esercizio"].isin(esercizi_cat), "livello_num"]
+        if not livelli.empty:
+            radar_labels.append(cat.capitalize())
+            radar_values.append(round(livelli.mean(), 2))
+
+    if not radar_labels:
+        return None
+    fig = go.Figure(data=go.Scatterpolar(r=radar_values, theta=radar_labels, fill="toself"))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 5])), showlegend=False)
+    return fig
@@ -0,0 +1,89 @@
+import pandas as pd
+import streamlit as st
+
+import dati
+import pagine
+
+
+# Pagina: Gestione Benchmark (solo per coach)
+def mostra(utente):
+    st.subheader("⚙️ Gestione Benchmark")
+    _gestione(utente)
+
+
+# Frammento: modificare un campo riesegue solo questa parte, non tutto lo script
+@st.fragment
+def _gestione(utente):
+    pagine.fissa_versioni_frammento()
+    esercizi_df = dati.carica("esercizi")
+    benchmark_df = dati.carica("benchmark")
+
+    st.info("Sei nell'area riservata ai coach per gestire i dati di benchmark.")
+
+    # Visualizza i benchmark esistenti
+    st.write("### Benchmark esistenti:")
+    st.dataframe(benchmark_df)
+
+    # Aggiungi un nuovo benchmark
+    st.write("### Aggiungi un nuovo benchmark:")
+    nuovo_esercizio = st.selectbox("Esercizio", esercizi_df["esercizio"].unique(), key="aggiungi_esercizio")
+    # Il tipo di valore del benchmark è quello dell'esercizio
+    tipo_valore = esercizi_df.loc[esercizi_df["esercizio"] == nuovo_esercizio, "tipo_valore"].iloc[0] if nuovo_esercizio else None
+    genere = st.selectbox("Genere", ["Maschio", "Femmina", "Altro"], key="aggiungi_genere")
+    base = st.text_input("Base", key="aggiungi_base")
+    principiante = st.text_input("Principiante", key="aggiungi_principiante")
+    intermedio = st.text_input("Intermedio", key="aggiungi_intermedio")
+    buono = st.text_input("Buono", key="aggiungi_buono")
+    elite = st.text_input("Elite", key="aggiungi_elite")
+
+    if st.button("Aggiungi benchmark", key="aggiungi_benchmark_button"):
+        if nuovo_esercizio and tipo_valore and genere and base and principiante and intermedio and buono and elite:
+            nuovo_record = {
+                "esercizio": nuovo_esercizio,
+                "tipo_valore": tipo_valore,
+                "genere": genere,
+                "base": base,
+                "principiante": principiante,
+                "intermedio": intermedio,
+                "buono": buono,
+                "elite": elite
+            }
+            # La modifica si applica all'ultima versione della tabella, non a quella letta qui
+            dati.modifica("benchmark", lambda df: pd.concat([df, pd.DataFrame([nuovo_record])], ignore_index=True))
+            st.success("Nuovo benchmark aggiunto con successo!")
+        else:
+            st.error("Compila tutti i campi per aggiungere un benchmark.")
+
+    # Elimina un benchmark esistente
+    st.write("### Elimina un benchmark:")
+    benchmark_da_eliminare = st.selectbox("Seleziona un benchmark da eliminare", benchmark_df[["esercizio", "genere"]].apply(lambda x: f"{x['esercizio']} ({x['genere']})", axis=1), key="elimina_benchmark")
+
+    if st.button("Elimina benchmark", key="elimina_benchmark_button"):
+        esercizio, genere = benchmark_da_eliminare.rsplit(" (", 1)
+        genere = genere.rstrip(")")
+        dati.modifica("benchmark", lambda df: df[~((df["esercizio"] == esercizio) & (df["genere"] == genere))])
+        st.success("Benchmark eliminato con successo!")
+
+    # Modifica un benchmark esistente
+    st.write("### Modifica un benchmark esistente:")
+    benchmark_da_modificare = st.selectbox("Seleziona un benchmark da modificare", benchmark_df[["esercizio", "genere"]].apply(lambda x: f"{x['esercizio']} ({x['genere']})", axis=1), key="modifica_benchmark")
+    if benchmark_da_modificare:
+        esercizio, genere = benchmark_da_modificare.rsplit(" (", 1)
+        genere = genere.rstrip(")")
+        benchmark_selezionato = benchmark_df[(benchmark_df["esercizio"] == esercizio) & (benchmark_df["genere"] == genere)].iloc[0]
+        nuovo_tipo_valore = st.selectbox("Tipo di valore", ["kg", "kg_rel", "reps", "tempo", "valore"], index=["kg", "kg_rel", "reps", "tempo", "valore"].index(benchmark_selezionato["tipo_valore"]), key="modifica_tipo_valore")
+        nuovo_genere = st.selectbox("Genere", ["Maschio", "Femmina", "Altro"], index=["Maschio", "Femmina", "Altro"].index(benchmark_selezionato["genere"]), key="modifica_genere")
+        nuovo_base = st.text_input("Base", value=benchmark_selezionato["base"], key="modifica_base")
+        nuovo_principiante = st.text_input("Principiante", value=benchmark_selezionato["principiante"], key="modifica_principiante")
+        nuovo_intermedio = st.text_input("Intermedio", value=benchmark_selezionato["intermedio"], key="modifica_intermedio")
+        nuovo_buono = st.text_input("Buono", value=benchmark_selezionato["buono"], key="modifica_buono")
+        nuovo_elite = st.text_input("Elite", value=benchmark_selezionato["elite"], key="modifica_elite")
+
+        if st.button("Salva modifiche", key="salva_modifiche_benchmark"):
+            def aggiorna(df):
+                df.loc[(df["esercizio"] == esercizio) & (df["genere"] == genere), ["tipo_valore", "genere", "base", "principiante", "intermedio", "buono", "elite"]] = [
+                    nuovo_tipo_valore, nuovo_genere, nuovo_base, nuovo_principiante, nuovo_intermedio, nuovo_buono, nuovo_elite
+                ]
+                return df
+            dati.modifica("benchmark", aggiorna)
+            st.success("Benchmark modificato con successo!")
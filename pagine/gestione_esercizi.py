@@ -0,0 +1,48 @@
+import pandas as pd
+import streamlit as st
+
+import dati
+import richiami
+
+
+# Pagina: Gestione Esercizi (solo per coach)
+def mostra(utente):
+    esercizi_df = dati.carica("esercizi")
+
+    st.subheader("⚙️ Gestione Esercizi")
+    st.info("Sei nell'area riservata ai coach.")
+
+    # Visualizza gli esercizi esistenti
+    st.write("### Esercizi esistenti:")
+    st.dataframe(esercizi_df)
+
+    # Aggiungi un nuovo esercizio
+    st.write("### Aggiungi un nuovo esercizio:")
+    nuovo_esercizio = st.text_input("Nome esercizio")
+    categoria = st.selectbox("Categoria", ["forza", "ginnastica", "metabolico"])
+    tipo_valore = st.selectbox("Tipo di valore", ["kg", "kg_rel", "reps", "tempo", "valore"])
+    settimane = st.number_input("Ripeti il test ogni (settimane)", min_value=1, max_value=52,
+                                value=richiami.INTERVALLO_PREDEFINITO, step=1)
+
+    if st.button("Aggiungi esercizio"):
+        if nuovo_esercizio and categoria and tipo_valore:
+            nuovo_record = {"esercizio": nuovo_esercizio, "categoria": categoria, "tipo_valore": tipo_valore,
+                            richiami.COLONNA_INTERVALLO: settimane}
+            dati.modifica("esercizi", lambda df: pd.concat([df, pd.DataFrame([nuovo_record])], ignore_index=True))
+            st.success("Esercizio aggiunto con successo!")
+        else:
+            st.error("Compila tutti i campi per aggiungere un esercizio.")
+
+    # Elimina un esercizio esistente
+    st.write("### Elimina un esercizio:")
+    esercizio_da_eliminare = st.selectbox("Seleziona un esercizio da eliminare", esercizi_df["esercizio"])
+
+    if st.button("Elimina esercizio"):
+        dati.modifica("esercizi", lambda df: df[df["esercizio"] != esercizio_da_eliminare])
+        st.success("Esercizio eliminato con successo!")
+
+    # Elimina i dati di tutti gli utenti
+    st.write("### Elimina i dati di tutti gli utenti:")
+    if st.button("Elimina tutti i dati utenti", key="elimina_tutti_utenti"):
+        dati.modifica("utenti", lambda df: df.iloc[0:0])  # Rimuove tutti i dati mantenendo le colonne
+        st.success("Tutti i dati degli utenti sono stati eliminati con successo!")
@@ -0,0 +1,104 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import dati
+import valutazione
+from figure import figura
+from livelli_correnti import livelli_correnti
+
+
+# Pagina: Grafici (grafico a barre orizzontali per risultati esercizi)
+def mostra(utente):
+    esercizi_df = dati.carica("esercizi")
+
+    st.subheader("📊 Risultati esercizi (Grafico a barre orizzontali)")
+
+    # Selezione categoria prima di esercizio
+    categorie_disponibili = esercizi_df["categoria"].unique()
+    categoria_selezionata = st.selectbox("Seleziona categoria", categorie_disponibili)
+    esercizi_filtrati = esercizi_df[esercizi_df["categoria"] == categoria_selezionata]["esercizio"].unique()
+    esercizio_selezionato = st.selectbox("Seleziona esercizio", esercizi_filtrati)
+
+    # Valutazione e figura riusate finché i test e i benchmark non cambiano
+    barra = figura("grafici", utente['nome'], esercizio_selezionato,
+                   lambda: _barra_livello(utente, esercizio_selezionato))
+    if barra is not None:
+        livello, valore, progresso, fig = barra
+        st.write(f"**Livello raggiunto:** {livello}")
+        st.write(f"**Valore inserito:** {valore}")
+        st.progress(progresso, text=f"Progresso verso Elite: {int(progresso*100)}%")
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Grafico radar per atleta (tutte le macro-categorie)
+    if utente['ruolo'] == 'atleta':
+        st.subheader("📊 Profilo Radar: Tutte le Macro-Categorie")
+        radar = figura("grafici", utente['nome'], "radar",
+                       lambda: _radar_categorie(utente, dati.carica("esercizi")))
+        if radar is not None:
+            fig, radar_labels, radar_values = radar
+            st.plotly_chart(fig, use_container_width=True)
+            # Miglioria: mostra valori numerici accanto alle etichette
+            for label, value in zip(radar_labels, radar_values):
+                st.write(f"**{label}**: {value}/5")
+        else:
+            st.info("Non ci sono dati sufficienti per generare il grafico radar.")
+
+
+def _barra_livello(utente, esercizio_selezionato):
+    atleta_test = dati.filtra("test", "nome", utente['nome'])
+    atleta_test = atleta_test[atleta_test['esercizio'] == esercizio_selezionato]
+    if atleta_test.empty:
+        return None
+
+    atleta_test = valutazione.valuta(atleta_test, genere_predefinito=utente['genere'])
+    row = atleta_test.iloc[-1]
+    progresso = row['livello_num'] / max(valutazione.livelli_val.values())
+
+    # Barra orizzontale con Plotly per chiarezza
+    fig = go.Figure(go.Bar(
+        x=[progresso*100],
+        y=[esercizio_selezionato],
+        orientation='h',
+        marker=dict(
+            color='rgba(0, 123, 255, 0.7)',
+            line=dict(color='rgba(0, 123, 255, 1.0)', width=8)
+        ),
+        text=[f"{row['valore']} ({row['livello']})"],
+        textposition='outside'
+    ))
+    fig.update_layout(
+        xaxis=dict(range=[0, 100], title="Progresso verso Elite (%)"),
+        yaxis=dict(title="Esercizio"),
+        title=f"Progresso su {esercizio_selezionato}",
+        bargap=0.4,
+        height=200
+    )
+    return row['livello'], row['valore'], progresso, fig
+
+
+def _radar_categorie(utente, esercizi_df):
+    radar_labels = []
+    radar_values = []
+    test_valutati = livelli_correnti().atleta(utente['nome'])
+    for categoria in esercizi_df["categoria"].unique():
+        esercizi_cat = esercizi_df[esercizi_df['categoria'] == categoria]['esercizio']
+        livelli_cat = test_valutati.loc[test_valutati['esercizio'].isin(esercizi_cat), 'livello_num']
+        if not livelli_cat.empty:
+            radar_labels.append(categoria.capitalize())
+            radar_values.append(round(livelli_cat.mean(), 2))
+    if not radar_labels:
+        return None
+
+    fig = go.Figure(data=go.Scatterpolar(
+        r=radar_values,
+        theta=radar_labels,
+        fill='toself',
+        marker=dict(color='rgba(0,123,255,0.7)')
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 5])),
+        showlegend=False,
+        title="Profilo Radar per Macro-Categoria",
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    return fig, radar_labels, radar_values
@@ -0,0 +1,248 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+import dati
+import importazione
+import pagine
+import richiami
+import valutazione
+
+
+# Pagina: Inserisci nuovo test
+def mostra(utente):
+    st.subheader("➕ Inserisci un nuovo test")
+    # I coach possono anche inserire una classe intera o caricare un foglio di risultati
+    modalita = "Singolo test"
+    if utente['ruolo'] == 'coach':
+        modalita = st.radio("Modalità", ["Singolo test", "Griglia classe", "Importa da foglio"], horizontal=True)
+    if modalita == "Griglia classe":
+        _griglia_classe()
+    elif modalita == "Importa da foglio":
+        _importa_foglio()
+    else:
+        _modulo_test(utente)
+
+
+# Frammento: modificare un campo riesegue solo questa parte, non tutto lo script
+@st.fragment
+def _modulo_test(utente):
+    pagine.fissa_versioni_frammento()
+    utenti_df = dati.carica("utenti")
+    esercizi_df = dati.carica("esercizi")
+    test_df = dati.carica("test")
+
+    # Selezione categoria prima di esercizio
+    categorie_disponibili = esercizi_df["categoria"].unique()
+    categoria_selezionata = st.selectbox("Seleziona categoria", categorie_disponibili)
+    esercizi_filtrati = esercizi_df[esercizi_df["categoria"] == categoria_selezionata]["esercizio"].unique()
+    nome_atleta = utente['nome'] if utente['ruolo'] == 'atleta' else st.selectbox("Seleziona atleta", utenti_df[utenti_df['ruolo'] == 'atleta']['nome'].unique())
+    esercizio = st.selectbox("Esercizio", esercizi_filtrati)
+    tipo_valore = esercizi_df[esercizi_df["esercizio"] == esercizio]["tipo_valore"].values[0]
+    genere = st.selectbox("Genere", ["Maschio", "Femmina", "Altro"], key="genere_test")  # Aggiunto campo per il genere
+
+    if tipo_valore == "tempo":
+        minuti = st.number_input("Minuti", min_value=0, max_value=59, step=1)
+        secondi = st.number_input("Secondi", min_value=0, max_value=59, step=1)
+        valore = f"{int(minuti):02d}:{int(secondi):02d}"
+    else:
+        valore = st.number_input("Valore", step=1.0)
+
+    data_test = st.date_input("Data", value=datetime.date.today())
+    peso_corporeo = utente["peso"] if utente["ruolo"] == "atleta" else st.number_input("Peso corporeo (kg)", min_value=30.0, max_value=200.0, step=0.1)
+
+    # 🔁 BLOCCO SOSTITUITO: if st.button("Salva test"):
+    if st.button("Salva test"):
+        relativo = None
+        # Ensure peso_corporeo is properly checked before comparison
+        if tipo_valore == "kg_rel" and peso_corporeo is not None and peso_corporeo > 0:
+            relativo = round(float(valore) / float(peso_corporeo), 2)
+
+        nuovo_test = {
+            "nome": nome_atleta,
+            "esercizio": esercizio,
+            "valore": valore,
+            "tipo_valore": tipo_valore,
+            "peso_corporeo": peso_corporeo,
+            "relativo": relativo,
+            "data": data_test.strftime("%Y-%m-%d"),
+            "genere": genere
+        }
+        test_df = dati.aggiungi("test", [nuovo_test])  # accodato al giornale, niente riscrittura del CSV
+        st.success("Test salvato correttamente!")
+
+        # Feedback intelligente: valuta in un colpo solo lo storico dell'atleta su questo esercizio
+        test_utente = dati.filtra("test", "nome", nome_atleta)
+        test_utente = test_utente[test_utente["esercizio"] == esercizio]
+        test_utente = test_utente.sort_values("data", kind="stable")
+
+        # Calcolo valore attuale e livello (lookup O(1) sull'indice dei benchmark)
+        if tipo_valore == "tempo":
+            val_attuale = int(minuti) * 60 + int(secondi)
+        elif tipo_valore == "kg_rel":
+            val_attuale = relativo
+        else:
+            val_attuale = float(valore)
+
+        indice = valutazione.indice_benchmark()
+        livello_num = indice.livello(esercizio, genere, val_attuale)
+        livello_raggiunto = valutazione.etichetta(livello_num)
+        livello_prossimo, target_prossimo = indice.prossimo_livello(esercizio, genere, livello_num)
+
+        st.info(f"🎯 Hai raggiunto il livello **{livello_raggiunto}** nel test di **{esercizio}**.")
+        if livello_prossimo and target_prossimo:
+            st.warning(f"➡️ Obiettivo consigliato: livello **{livello_prossimo.capitalize()}** ({target_prossimo}).")
+        settimane = richiami.intervallo(esercizio)
+        st.caption(f"📅 Ripeti il test tra circa **{settimane:g} settimane** ({(data_test + datetime.timedelta(weeks=settimane)).strftime('%d/%m/%Y')}).")
+
+        # Miglioramento percentuale rispetto al test precedente
+        if len(test_utente) > 1:
+            penultimo = valutazione.valuta(test_utente.iloc[[-2]], genere_predefinito=genere).iloc[0]
+            val_prec = penultimo["valore_norm"]
+
+            if pd.notnull(val_prec) and val_prec != 0:
+                if tipo_valore == "tempo":
+                    delta = val_prec - val_attuale
+                    miglioramento = (delta / val_prec) * 100
+                else:
+                    delta = val_attuale - val_prec
+                    miglioramento = (delta / val_prec) * 100
+                st.success(f"📈 Miglioramento del **{miglioramento:.2f}%** rispetto al test precedente.")
+
+                # Badge sbloccato
+                if livello_raggiunto != valutazione.NON_VALUTABILE:
+                    if livello_num > penultimo["livello_num"]:
+                        st.balloons()
+                        st.success("🏅 Hai sbloccato un nuovo badge di livello!")
+
+    # Mostra l'expander solo dopo il salvataggio
+    if st.session_state.get('show_expander', False):
+        with st.expander("📊 Analisi del test appena inserito", expanded=True):
+            # 1. Calcola livello raggiunto (test appena inserito + storico precedente)
+            storico = test_df[
+                (test_df['nome'] == nome_atleta) &
+                (test_df['esercizio'] == esercizio) &
+                (test_df['data'] < data_test.strftime("%Y-%m-%d"))
+            ].sort_values("data", ascending=False)
+            nuovo = pd.DataFrame([{
+                "esercizio": esercizio, "valore": valore, "tipo_valore": tipo_valore,
+                "peso_corporeo": peso_corporeo, "genere": genere
+            }])
+            valutati = valutazione.valuta(pd.concat([nuovo, storico.head(1)], ignore_index=True), genere_predefinito=genere)
+            livello_raggiunto = valutati.loc[0, "livello"]
+            livello_num = valutati.loc[0, "livello_num"]
+            val = valutati.loc[0, "valore_norm"]
+
+            # 2. Consiglia prossimo livello e valore target
+            prossimo_livello, valore_target = valutazione.indice_benchmark().prossimo_livello(esercizio, genere, livello_num)
+
+            # Mostra risultati analisi post-salvataggio
+            st.info(f"**Livello raggiunto:** {livello_raggiunto}")
+            if prossimo_livello and valore_target is not None:
+                st.info(f"🎯 Obiettivo prossimo livello: **{prossimo_livello.capitalize()}** (target: {valore_target})")
+            elif livello_raggiunto == "Elite":
+                st.success("🏆 Complimenti! Hai raggiunto il livello massimo (Elite).")
+
+            # 3. Suggerisci quando ripetere il test (intervallo di richiamo dell'esercizio)
+            data_prossimo_test = data_test + datetime.timedelta(weeks=richiami.intervallo(esercizio))
+            st.info(f"🔁 Ripeti questo test il: **{data_prossimo_test.strftime('%Y-%m-%d')}**")
+
+            # 4. Calcola miglioramento percentuale rispetto al test precedente
+            if len(valutati) > 1:
+                val_prec = valutati.loc[1, "valore_norm"]
+
+                # Calcola miglioramento percentuale (attenzione: per il tempo, meno è meglio)
+                if pd.notnull(val) and pd.notnull(val_prec) and val_prec > 0:
+                    if tipo_valore == 'tempo':
+                        miglioramento = (val_prec - val) / val_prec * 100
+                    else:
+                        miglioramento = (val - val_prec) / val_prec * 100
+                    st.info(f"📈 Miglioramento rispetto al test precedente: **{miglioramento:+.2f}%**")
+
+                # 5. Badge se migliora di livello
+                if livello_num > valutati.loc[1, "livello_num"]:
+                    st.success("🎉 **Complimenti! Hai sbloccato un nuovo livello!**")
+
+            # Alla fine, resetta il flag per non mostrare l'expander al prossimo caricamento
+            st.session_state['show_expander'] = False
+
+
+@st.fragment
+def _griglia_classe():
+    pagine.fissa_versioni_frammento()
+    esercizi_df = dati.carica("esercizi")
+    utenti_df = dati.carica("utenti")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        categoria = st.selectbox("Categoria", esercizi_df["categoria"].unique(), key="griglia_categoria")
+    with col2:
+        data_test = st.date_input("Data", value=datetime.date.today(), key="griglia_data")
+    atleti_df = utenti_df[utenti_df["ruolo"] == "atleta"]
+    atleti = st.multiselect("Atleti presenti", atleti_df["nome"].unique(), default=atleti_df["nome"].unique(), key="griglia_atleti")
+    esercizi = esercizi_df[esercizi_df["categoria"] == categoria].drop_duplicates("esercizio")
+    if not atleti or esercizi.empty:
+        return
+
+    # Una riga per atleta, una colonna per esercizio (minuti e secondi per il tempo)
+    colonne = importazione.colonne_griglia(esercizi)
+    presenti = atleti_df[atleti_df["nome"].isin(atleti)].drop_duplicates("nome")
+    griglia = pd.DataFrame({"nome": presenti["nome"].to_numpy(), "peso_corporeo": pd.to_numeric(presenti["peso"], errors="coerce").to_numpy()})
+    griglia = griglia.reindex(columns=["nome", "peso_corporeo", *colonne])
+    configurazione = {
+        "nome": st.column_config.TextColumn("Atleta", disabled=True),
+        "peso_corporeo": st.column_config.NumberColumn("Peso (kg)", min_value=30.0, max_value=200.0, step=0.1),
+    }
+    for colonna in colonne:
+        if colonna.endswith("(sec)"):
+            configurazione[colonna] = st.column_config.NumberColumn(colonna, min_value=0, max_value=59, step=1)
+        elif colonna.endswith("(min)"):
+            configurazione[colonna] = st.column_config.NumberColumn(colonna, min_value=0, step=1)
+        else:
+            configurazione[colonna] = st.column_config.NumberColumn(colonna, min_value=0)
+    griglia = st.data_editor(griglia, column_config=configurazione, hide_index=True, num_rows="fixed",
+                             use_container_width=True, key=f"griglia_{categoria}")
+
+    if st.button("Salva griglia", key="griglia_salva"):
+        foglio = importazione.foglio_da_griglia(griglia, esercizi, data_test)
+        test, scartate = importazione.prepara(foglio, esercizi_df, utenti_df)
+        if not scartate.empty:
+            st.warning(f"⚠️ {len(scartate)} celle non valide ignorate:")
+            st.dataframe(scartate[["nome", "esercizio", "valore", "errore"]], hide_index=True)
+        if test.empty:
+            st.info("Nessun risultato inserito nella griglia.")
+            return
+        importazione.importa(test)
+        st.success(f"{len(test)} test salvati correttamente!")
+        st.dataframe(test[["nome", "esercizio", "valore", "livello"]], hide_index=True, use_container_width=True)
+
+
+@st.fragment
+def _importa_foglio():
+    pagine.fissa_versioni_frammento()
+    st.caption("Colonne richieste: nome, esercizio, valore, data (tempo come mm:ss). "
+               "Facoltative: peso_corporeo, genere (altrimenti presi dal profilo dell'atleta).")
+    file = st.file_uploader("Foglio dei risultati", type=["csv", "xlsx"], key="import_foglio")
+    if file is None:
+        return
+
+    try:
+        test, scartate = importazione.prepara(importazione.leggi_foglio(file), dati.carica("esercizi"), dati.carica("utenti"))
+    except ValueError as errore:
+        st.error(str(errore))
+        return
+
+    if not scartate.empty:
+        st.warning(f"⚠️ {len(scartate)} righe non valide verranno ignorate:")
+        st.dataframe(scartate[["riga", "nome", "esercizio", "valore", "errore"]], hide_index=True)
+    if test.empty:
+        st.info("Nessuna riga valida da importare.")
+        return
+
+    # Anteprima con i livelli già calcolati
+    st.write(f"### Anteprima: {len(test)} test")
+    st.dataframe(test.drop(columns=["livello_num"]), hide_index=True, use_container_width=True)
+    if st.button(f"Importa {len(test)} test", key="import_conferma"):
+        importazione.importa(test)
+        st.success(f"{len(test)} test importati correttamente!")
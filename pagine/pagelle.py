@@ -0,0 +1,40 @@
+import datetime
+import io
+import zipfile
+
+import streamlit as st
+
+import dati
+import pagelle
+
+
+# Pagina: Pagelle di fine ciclo (solo coach)
+def mostra(utente):
+    utenti_df = dati.carica("utenti")
+
+    st.subheader("📄 Pagelle di fine ciclo")
+    st.info("Una pagella PDF per atleta: livelli per area, radar, miglioramenti e prossimi obiettivi.")
+
+    atleti = utenti_df[utenti_df["ruolo"] == "atleta"]["nome"].unique()
+    scelti = st.multiselect("Atleti", atleti, default=atleti, key="pagelle_atleti")
+
+    if st.button("Genera pagelle", key="pagelle_genera", disabled=not len(scelti)):
+        # Una sola valutazione per tutti, poi i PDF in parallelo
+        contenuti = pagelle.contenuti_pagelle(scelti)
+        if not contenuti:
+            st.info("Nessun test registrato per gli atleti scelti.")
+            return
+        barra = st.progress(0.0, text="Generazione in corso...")
+        generate = pagelle.genera_pagelle(
+            contenuti, progresso=lambda fatte, totali: barra.progress(fatte / totali, text=f"{fatte}/{totali} pagelle")
+        )
+
+        archivio = io.BytesIO()
+        with zipfile.ZipFile(archivio, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for nome, pdf in generate.items():
+                zip_file.writestr(f"pagella_{nome.replace(' ', '_')}.pdf", pdf)
+        st.success(f"{len(generate)} pagelle generate.")
+        st.download_button(
+            "Scarica pagelle (.zip)", archivio.getvalue(),
+            file_name=f"pagelle_{datetime.date.today().strftime('%Y-%m-%d')}.zip", mime="application/zip",
+        )
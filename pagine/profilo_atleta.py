@@ -0,0 +1,49 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+import dati
+
+
+# Pagina: Profilo Atleta
+def mostra(utente):
+    utenti_df = dati.carica("utenti")
+
+    # Carica i dati dell'atleta
+    atleta = utenti_df[utenti_df['nome'] == utente['nome']].squeeze()
+
+    # Mostra i dati attuali
+    st.write("### Dati attuali:")
+    st.write(f"**Nome:** {atleta['nome']}")
+    st.write(f"**Ruolo:** {atleta['ruolo']}")
+    st.write(f"**Data di nascita:** {atleta['data_nascita']}")
+    st.write(f"**Peso corporeo:** {atleta['peso']} kg")
+    st.write(f"**Genere:** {atleta['genere']}")
+
+    # Modifica i dati
+    st.write("### Modifica i tuoi dati:")
+    data_nascita_default = pd.to_datetime(atleta['data_nascita']) if pd.notnull(atleta['data_nascita']) else datetime.date(2000, 1, 1)
+    nuova_data_nascita = st.date_input(
+        "Data di nascita",
+        value=data_nascita_default,
+        min_value=datetime.date(1960, 1, 1)
+    )
+    nuovo_peso = st.number_input("Peso corporeo (kg)", min_value=30.0, max_value=200.0, step=0.1, value=float(atleta['peso']) if pd.notnull(atleta['peso']) else 70.0)
+    nuovo_genere = st.selectbox(
+        "Genere",
+        options=["Maschio", "Femmina", "Altro"],
+        index=["Maschio", "Femmina", "Altro"].index(atleta['genere']) if atleta['genere'] in ["Maschio", "Femmina", "Altro"] else 0
+    )
+
+    if st.button("Salva modifiche"):
+        # Aggiorna i dati nell'ultima versione della tabella
+        def aggiorna(df):
+            df.loc[df['nome'] == utente['nome'], 'data_nascita'] = nuova_data_nascita.strftime("%Y-%m-%d")
+            df.loc[df['nome'] == utente['nome'], 'peso'] = nuovo_peso
+            df.loc[df['nome'] == utente['nome'], 'genere'] = nuovo_genere
+            return df
+
+        # Il CSV viene riscritto in background
+        dati.modifica("utenti", aggiorna)
+        st.success("Dati aggiornati con successo!")
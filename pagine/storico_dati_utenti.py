@@ -0,0 +1,86 @@
+import math
+import tempfile
+
+import pandas as pd
+import streamlit as st
+
+import dati
+import esportazione
+
+TUTTI = "Tutti"
+ORDINAMENTI = {"Data": "data", "Atleta": "nome", "Esercizio": "esercizio"}
+
+
+# Pagina: Storico Dati Utenti (solo per coach)
+def mostra(utente):
+    utenti_df = dati.carica("utenti")
+    esercizi_df = dati.carica("esercizi")
+
+    st.subheader("📋 Storico Dati Utenti")
+
+    # Export completo: il file viene scritto su disco riga per riga, non costruito in memoria
+    with st.expander("⬇️ Esporta tutto lo storico in Excel"):
+        st.caption("Fogli: test con livello, livelli correnti, risultati WOD, utenti (senza PIN).")
+        if st.button("Prepara file Excel", key="storico_esporta"):
+            with tempfile.TemporaryFile() as file:
+                esportazione.esporta(file)
+                file.seek(0)
+                st.download_button(
+                    "Scarica storico (.xlsx)", file.read(), file_name=f"storico_{pd.Timestamp.today():%Y-%m-%d}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", key="storico_scarica",
+                )
+
+    # Filtri: vengono applicati dall'archivio, non sul browser
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        atleta = st.selectbox("Atleta", [TUTTI, *utenti_df["nome"].unique()], key="storico_atleta")
+    with col2:
+        categoria = st.selectbox("Categoria", [TUTTI, *esercizi_df["categoria"].unique()], key="storico_categoria")
+    esercizi_categoria = esercizi_df if categoria == TUTTI else esercizi_df[esercizi_df["categoria"] == categoria]
+    with col3:
+        esercizio = st.selectbox("Esercizio", [TUTTI, *esercizi_categoria["esercizio"].unique()], key="storico_esercizio")
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        periodo = st.date_input("Periodo", value=(), key="storico_periodo")
+    with col2:
+        ordina = st.selectbox("Ordina per", list(ORDINAMENTI), key="storico_ordina")
+    with col3:
+        crescente = st.selectbox("Verso", ["Decrescente", "Crescente"], key="storico_verso") == "Crescente"
+    with col4:
+        righe_per_pagina = st.selectbox("Righe per pagina", [25, 50, 100], key="storico_righe")
+
+    uguali = {}
+    if atleta != TUTTI:
+        uguali["nome"] = atleta
+    if esercizio != TUTTI:
+        uguali["esercizio"] = esercizio
+    elif categoria != TUTTI:
+        uguali["esercizio"] = list(esercizi_categoria["esercizio"])
+    tra = {}
+    if periodo:
+        # Con una sola data scelta l'intervallo resta aperto in fondo
+        tra["data"] = (pd.Timestamp(periodo[0]), pd.Timestamp(periodo[1]) if len(periodo) > 1 else None)
+
+    # Prima lettura per sapere quante pagine ci sono, poi la pagina scelta
+    pagina = st.session_state.get("storico_pagina", 1)
+    test_pagina, totale = dati.sfoglia("test", uguali, tra, ORDINAMENTI[ordina], crescente, pagina, righe_per_pagina)
+    pagine = max(1, math.ceil(totale / righe_per_pagina))
+    if pagina > pagine:
+        st.session_state["storico_pagina"] = pagina = 1
+        test_pagina, totale = dati.sfoglia("test", uguali, tra, ORDINAMENTI[ordina], crescente, pagina, righe_per_pagina)
+
+    if totale == 0:
+        st.info("Nessun test corrisponde ai filtri scelti.")
+        return
+
+    st.dataframe(
+        test_pagina.drop(columns=dati.COLONNE_DERIVATE["test"], errors="ignore"),
+        hide_index=True, use_container_width=True,
+    )
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Pagina", min_value=1, max_value=pagine, step=1, key="storico_pagina")
+    with col2:
+        primo = (pagina - 1) * righe_per_pagina + 1
+        st.caption(f"Righe {primo}–{primo + len(test_pagina) - 1} di {totale} (pagina {pagina} di {pagine})")
@@ -0,0 +1,106 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import valutazione
+from figure import figura
+from tendenze import tendenze
+
+# Unità del valore normalizzato, per asse e metriche
+UNITA = {"tempo": "secondi", "kg_rel": "kg per kg corporeo", "kg": "kg", "reps": "ripetizioni"}
+
+
+# Pagina: Storico Progressi
+def mostra(utente):
+    st.subheader("📈 Storico Progressi per Esercizio")
+    andamenti = tendenze()
+
+    # I coach vedono la panoramica di tutti e scelgono l'atleta da approfondire
+    nome = utente['nome']
+    if utente['ruolo'] == 'coach':
+        riepilogo = andamenti.riepilogo()
+        if riepilogo.empty:
+            st.info("Non ci sono ancora test registrati.")
+            return
+        st.write("### Panoramica atleti")
+        st.dataframe(_tabella_riepilogo(riepilogo), hide_index=True, use_container_width=True)
+        nome = st.selectbox("Atleta", riepilogo["nome"].unique(), key="progressi_atleta")
+
+    riepilogo_atleta = andamenti.riepilogo(nome)
+    if riepilogo_atleta.empty:
+        st.info("Non ci sono test disponibili per questo utente.")
+        return
+    esercizio_sel = st.selectbox("Seleziona esercizio", riepilogo_atleta["esercizio"].unique())
+    riga = riepilogo_atleta[riepilogo_atleta["esercizio"] == esercizio_sel].iloc[0]
+
+    fig = figura("storico_progressi", nome, esercizio_sel,
+                 lambda: _andamento(tendenze().serie(nome, esercizio_sel), esercizio_sel))
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Tendenza e proiezione sul prossimo livello
+    unita = UNITA.get(riga["tipo_valore"], "")
+    ultima = andamenti.serie(nome, esercizio_sel)["miglioramento_pct"].iloc[-1]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Tendenza", "—" if pd.isna(riga["pendenza"]) else f"{riga['pendenza'] * 7:+.2f} {unita}/sett.")
+    col2.metric("Ultimo test", "—" if pd.isna(ultima) else f"{ultima:+.1f}%")
+    col3.metric("Livello attuale", riga["livello"])
+    if riga["prossimo"]:
+        target = _formatta(riga["target"], riga["tipo_valore"])
+        if pd.notna(riga["data_prevista"]) and riga["data_prevista"] < pd.Timestamp.today().normalize():
+            st.info(f"🎯 Con il ritmo dei tuoi test il livello **{riga['prossimo'].capitalize()}** ({target}) "
+                    "dovrebbe essere già alla portata: ripeti il test!")
+        elif pd.notna(riga["data_prevista"]):
+            st.info(f"🎯 Con questo ritmo raggiungi il livello **{riga['prossimo'].capitalize()}** ({target}) "
+                    f"intorno al **{riga['data_prevista'].strftime('%d/%m/%Y')}**.")
+        else:
+            st.caption(f"🎯 Prossimo livello: {riga['prossimo'].capitalize()} ({target}). "
+                       "Servono più test in miglioramento per stimare quando.")
+
+
+def _formatta(valore, tipo_valore):
+    return valutazione.formatta_secondi(valore) if tipo_valore == "tempo" else f"{valore:g}"
+
+
+def _tabella_riepilogo(riepilogo):
+    tabella = riepilogo[["nome", "esercizio", "test", "livello", "pendenza", "prossimo", "data_prevista"]]
+    return tabella.assign(
+        pendenza=(tabella["pendenza"] * 7).round(3),
+        prossimo=tabella["prossimo"].str.capitalize(),
+        data_prevista=tabella["data_prevista"].dt.date,
+    ).rename(columns={"pendenza": "tendenza/sett.", "data_prevista": "prossimo livello previsto"})
+
+
+def _andamento(serie, esercizio_sel):
+    tipo_valore = serie["tipo_valore"].iloc[-1]
+    testo = [
+        f"Valore: {v}<br>Livello: {l}" for v, l in zip(serie['valore'], serie['livello'])
+    ]
+
+    # Valori normalizzati e miglior risultato fino a quella data
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=serie["data"],
+        y=serie["valore_norm"],
+        name="Test",
+        mode='lines+markers',
+        marker=dict(size=10, color='rgba(0,123,255,0.8)'),
+        line=dict(color='rgba(0,123,255,0.5)', width=2),
+        text=testo,
+        hoverinfo='text'
+    ))
+    fig.add_trace(go.Scatter(
+        x=serie["data"],
+        y=serie["migliore"],
+        name="Miglior risultato",
+        mode='lines',
+        line=dict(color='rgba(40,167,69,0.8)', width=2, dash='dash', shape='hv'),
+    ))
+    fig.update_layout(
+        xaxis_title="Data",
+        yaxis_title=UNITA.get(tipo_valore, "Valore").capitalize(),
+        title=f"Andamento nel tempo: {esercizio_sel}",
+        height=400
+    )
+    if tipo_valore == "tempo":
+        fig.update_yaxes(autorange="reversed")  # meno tempo è meglio: in alto i risultati migliori
+    return fig
@@ -0,0 +1,14 @@
+import streamlit as st
+
+import dati
+
+
+# Pagina: Storico Test (solo atleta)
+def mostra(utente):
+    st.subheader("📜 Storico dei Test Inseriti")
+    atleta_test = dati.filtra("test", "nome", utente['nome'])
+    if atleta_test.empty:
+        st.info("Non ci sono test disponibili per questo utente.")
+    else:
+        atleta_test = atleta_test.drop(columns=dati.COLONNE_DERIVATE["test"], errors="ignore")
+        st.dataframe(atleta_test.sort_values("data", ascending=False))
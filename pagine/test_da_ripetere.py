@@ -0,0 +1,33 @@
+import streamlit as st
+
+from richiami import richiami
+
+
+# Pagina: Test da ripetere (solo coach)
+def mostra(utente):
+    st.subheader("⏰ Test da ripetere")
+    st.caption("Scadenze calcolate dall'ultimo test di ogni atleta, con l'intervallo di richiamo "
+               "dell'esercizio (6 settimane se non indicato in Gestione Esercizi).")
+    scadenze = richiami()
+
+    scaduti = scadenze.scaduti()
+    settimana = scadenze.in_scadenza(giorni=7)
+    col1, col2 = st.columns(2)
+    col1.metric("Scaduti", len(scaduti))
+    col2.metric("In scadenza questa settimana", len(settimana))
+
+    tab_settimana, tab_scaduti = st.tabs(["📅 Questa settimana", "⚠️ Scaduti"])
+    with tab_settimana:
+        if settimana.empty:
+            st.success("✅ Nessun test in scadenza nei prossimi 7 giorni.")
+        else:
+            st.dataframe(_formatta(settimana), hide_index=True, use_container_width=True)
+    with tab_scaduti:
+        if scaduti.empty:
+            st.success("✅ Nessun test scaduto.")
+        else:
+            st.dataframe(_formatta(scaduti), hide_index=True, use_container_width=True)
+
+
+def _formatta(tabella):
+    return tabella.assign(ultimo_test=tabella["ultimo_test"].dt.date, scadenza=tabella["scadenza"].dt.date)
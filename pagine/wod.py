@@ -0,0 +1,64 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+import dati
+from classifiche import classifiche_wod
+
+
+# Pagina: WOD
+def mostra(utente):
+    wod_df = dati.carica("wod")
+
+    st.subheader("📒 Workout of the Day (WOD)")
+
+    oggi = datetime.date.today()
+    wod_oggi = wod_df[wod_df["data"] == pd.to_datetime(oggi)]
+
+    if not wod_oggi.empty:
+        wod = wod_oggi.iloc[0]
+        st.subheader(f"🏋️‍♂️ WOD del giorno: {wod['nome']}")
+
+        # Mostra i 3 livelli
+        st.markdown("### Livelli disponibili:")
+        st.markdown(f"**Principiante**: {wod['principiante']}")
+        st.markdown(f"**Intermedio**: {wod['intermedio']}")
+        st.markdown(f"**Avanzato**: {wod['avanzato']}")
+
+        st.divider()
+        st.subheader("📥 Inserisci il tuo risultato")
+
+        livello = st.radio("Livello scelto", ["principiante", "intermedio", "avanzato"])
+        tipo_valore = wod["tipo_valore"]
+
+        if tipo_valore == "tempo":
+            minuti = st.number_input("Minuti", min_value=0, max_value=59)
+            secondi = st.number_input("Secondi", min_value=0, max_value=59)
+            risultato = f"{int(minuti):02d}:{int(secondi):02d}"
+        else:
+            risultato = st.number_input("Risultato (reps o rounds)", step=1)
+
+        if st.button("Salva risultato"):
+            nuovo_record = {
+                "nome": utente["nome"],
+                "data_wod": oggi.strftime("%Y-%m-%d"),
+                "livello": livello,
+                "risultato": risultato,
+                "tipo_valore": tipo_valore
+            }
+            dati.aggiungi("wod_risultati", [nuovo_record])
+            st.success("Risultato salvato!")
+
+        st.divider()
+        st.subheader("📊 Classifica del giorno")
+
+        # Classifica già ordinata e divisa per giorno: non si rilegge né si riordina il file
+        classifica = classifiche_wod().del_giorno(oggi)
+
+        if not classifica.empty:
+            st.dataframe(classifica)
+        else:
+            st.info("Nessun risultato registrato oggi.")
+    else:
+        st.info("Nessun WOD pubblicato per oggi.")
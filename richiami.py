@@ -0,0 +1,113 @@
+from bisect import bisect_left, insort
+
+import pandas as pd
+
+import dati
+from livelli_correnti import livelli_correnti
+
+# Colonna facoltativa di esercizi.csv: ogni quante settimane ripetere il test
+COLONNA_INTERVALLO = "richiamo_settimane"
+INTERVALLO_PREDEFINITO = 6
+
+COLONNE = ["nome", "esercizio", "ultimo_test", "scadenza"]
+
+
+def intervalli(esercizi_df):
+    """Settimane tra un test e il successivo, per esercizio (6 se non indicato)."""
+    esercizi_df = esercizi_df.drop_duplicates("esercizio").set_index("esercizio")
+    if COLONNA_INTERVALLO not in esercizi_df:
+        return pd.Series(INTERVALLO_PREDEFINITO, index=esercizi_df.index, dtype=float)
+    settimane = pd.to_numeric(esercizi_df[COLONNA_INTERVALLO], errors="coerce")
+    return settimane.where(settimane > 0).fillna(INTERVALLO_PREDEFINITO)
+
+
+def intervallo(esercizio):
+    """Settimane dopo cui ripetere un esercizio."""
+    return intervalli(dati.carica("esercizi")).get(esercizio, INTERVALLO_PREDEFINITO)
+
+
+class Richiami(dati.StrutturaCondivisa):
+    """Scadenze dei test da ripetere per tutta la palestra, sempre in ordine di data.
+
+    ``ordine`` contiene terne (scadenza, nome, esercizio) ordinate: "scaduti" e "in scadenza"
+    sono intervalli della lista trovati con bisect, senza scandire i test.
+    """
+
+    TABELLE = ("test", "esercizi")
+    INCREMENTALE = "test"
+
+    def __init__(self):
+        super().__init__()
+        self._ordine = []
+        self._per_atleta = {}  # nome -> {esercizio: (ultimo_test, scadenza)}
+
+    def _ricostruisci(self):
+        # Le date degli ultimi test vengono dalla tabella dei livelli correnti
+        correnti = livelli_correnti().tabella()
+        settimane = intervalli(dati.carica("esercizi"))
+        correnti = correnti[correnti["data"].notna()]
+        if correnti.empty:
+            # Nessun test con una data: la colonna è vuota e non è di date
+            self._per_atleta, self._ordine = {}, []
+            return
+        scadenze = correnti["data"] + pd.to_timedelta(correnti["esercizio"].map(settimane).fillna(INTERVALLO_PREDEFINITO) * 7, unit="D")
+        per_atleta = {}
+        for nome, esercizio, data, scadenza in zip(correnti["nome"], correnti["esercizio"], correnti["data"], scadenze):
+            per_atleta.setdefault(nome, {})[esercizio] = (data, scadenza)
+        self._per_atleta = per_atleta
+        self._ordine = sorted(zip(scadenze, correnti["nome"], correnti["esercizio"]))
+
+    def _applica(self, modifiche):
+        correnti = livelli_correnti()
+        settimane = intervalli(dati.carica("esercizi"))
+        chiavi = set()
+        for _, righe in modifiche:
+            chiavi.update(zip(righe["nome"], righe["esercizio"]))
+        for nome, esercizio in chiavi:
+            record = correnti.ultimo(nome, esercizio)
+            self._aggiorna(nome, esercizio, record["data"] if record is not None else pd.NaT, settimane)
+
+    def _aggiorna(self, nome, esercizio, data, settimane):
+        esercizi = self._per_atleta.setdefault(nome, {})
+        precedente = esercizi.pop(esercizio, None)
+        if precedente is not None:
+            del self._ordine[bisect_left(self._ordine, (precedente[1], nome, esercizio))]
+        if pd.notna(data):
+            scadenza = data + pd.Timedelta(weeks=settimane.get(esercizio, INTERVALLO_PREDEFINITO))
+            esercizi[esercizio] = (data, scadenza)
+            insort(self._ordine, (scadenza, nome, esercizio))
+        if not esercizi:
+            del self._per_atleta[nome]
+
+    def _tabella(self, terne):
+        righe = [(nome, esercizio, self._per_atleta[nome][esercizio][0], scadenza) for scadenza, nome, esercizio in terne]
+        return pd.DataFrame(righe, columns=COLONNE)
+
+    def scaduti(self, oggi=None):
+        """Test che andavano ripetuti prima di oggi, dal più vecchio."""
+        oggi = pd.Timestamp.today().normalize() if oggi is None else pd.Timestamp(oggi)
+        with self._lock:
+            return self._tabella(self._ordine[:bisect_left(self._ordine, (oggi,))])
+
+    def in_scadenza(self, giorni=7, oggi=None):
+        """Test da ripetere da oggi ai prossimi ``giorni`` (la settimana, di default)."""
+        oggi = pd.Timestamp.today().normalize() if oggi is None else pd.Timestamp(oggi)
+        with self._lock:
+            da = bisect_left(self._ordine, (oggi,))
+            a = bisect_left(self._ordine, (oggi + pd.Timedelta(days=giorni),))
+            return self._tabella(self._ordine[da:a])
+
+    def atleta(self, nome):
+        """Scadenze di un atleta, una riga per esercizio, in ordine di data."""
+        with self._lock:
+            esercizi = self._per_atleta.get(nome, {})
+            righe = sorted((scadenza, nome, esercizio) for esercizio, (_, scadenza) in esercizi.items())
+            return self._tabella(righe)
+
+
+_richiami = Richiami()
+
+
+def richiami():
+    """Scadenze dei test da ripetere di tutta la palestra."""
+    return _richiami.allinea()
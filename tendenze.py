@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+import dati
+import valutazione
+
+# Oltre questo orizzonte la proiezione lineare non dice più nulla
+ORIZZONTE_MASSIMO = pd.Timedelta(days=5 * 365)
+
+COLONNE_SERIE = [
+    "nome", "esercizio", "data", "valore", "tipo_valore", "valore_norm", "livello", "livello_num",
+    "migliore", "miglioramento_pct",
+]
+
+
+class Tendenze(dati.StrutturaCondivisa):
+    """Andamento di ogni (atleta, esercizio), calcolato per tutti in un solo passaggio raggruppato.
+
+    Per ogni test: valore normalizzato (secondi per il tempo, kg per kg corporeo per kg_rel),
+    miglior risultato fino a quel momento e miglioramento % sul test precedente (positivo =
+    meglio, anche per il tempo). Per ogni coppia: pendenza della retta di regressione e data
+    prevista per raggiungere il livello successivo.
+    """
+
+    TABELLE = ("test", "benchmark", "utenti")
+
+    def __init__(self):
+        super().__init__()
+        self._serie = pd.DataFrame(columns=COLONNE_SERIE)
+        self._posizioni = {}  # (nome, esercizio) -> posizioni in _serie
+        self._riepilogo = pd.DataFrame()
+
+    def _ricostruisci(self):
+        indice = valutazione.indice_benchmark()
+        test = dati.carica("test")
+        test = valutazione.con_genere(test, valutazione.generi_atleti())
+        test = test.assign(nome=test["nome"].astype(object), esercizio=test["esercizio"].astype(object))
+        test = test.sort_values(["nome", "esercizio", "data"], kind="stable", na_position="first").reset_index(drop=True)
+        serie = valutazione.valuta(test, indice)
+
+        # Punteggio "più alto = meglio": per il tempo si cambia segno
+        segno = np.where(serie["tipo_valore"].astype(object) == "tempo", -1.0, 1.0)
+        punteggio = serie["valore_norm"] * segno
+        chiavi = [serie["nome"], serie["esercizio"]]
+        serie["migliore"] = punteggio.groupby(chiavi).cummax() * segno
+        precedente = punteggio.groupby(chiavi).shift()
+        serie["miglioramento_pct"] = ((punteggio - precedente) / precedente.abs().where(precedente != 0) * 100).round(1)
+
+        # Regressione lineare valore ~ giorni per gruppo, con le somme raggruppate
+        validi = serie[serie["valore_norm"].notna() & serie["data"].notna()]
+        gruppi = validi.groupby(["nome", "esercizio"], sort=False)
+        x = (validi["data"] - gruppi["data"].transform("min")).dt.days.astype(float)
+        y = validi["valore_norm"]
+        somme = pd.DataFrame({"x": x, "y": y, "xx": x * x, "xy": x * y}).groupby([validi["nome"], validi["esercizio"]], sort=False).sum()
+        n = gruppi.size()
+        denominatore = n * somme["xx"] - somme["x"] ** 2
+        pendenza = ((n * somme["xy"] - somme["x"] * somme["y"]) / denominatore.where(denominatore > 0)).rename("pendenza")
+
+        ultimi = serie.groupby(["nome", "esercizio"], sort=False).tail(1).set_index(["nome", "esercizio"])
+        riepilogo = ultimi[["tipo_valore", "genere", "data", "valore", "valore_norm", "livello", "livello_num", "migliore"]].copy()
+        riepilogo["test"] = serie.groupby(["nome", "esercizio"], sort=False).size()
+        riepilogo["pendenza"] = pendenza.reindex(riepilogo.index)
+
+        # Soglia del livello successivo (per chi è sotto "base", la soglia base)
+        posizioni = indice.chiavi.get_indexer(pd.MultiIndex.from_arrays([
+            riepilogo.index.get_level_values("esercizio"), riepilogo["genere"].astype(object),
+        ]))
+        livello_num = riepilogo["livello_num"].to_numpy()
+        ha_prossimo = (posizioni >= 0) & (livello_num < len(valutazione.LIVELLI))
+        soglie = np.full(len(riepilogo), np.nan)
+        soglie[ha_prossimo] = indice.soglie[posizioni[ha_prossimo], livello_num[ha_prossimo]]
+        prossimi = np.array(valutazione.LIVELLI, dtype=object)[np.minimum(livello_num, len(valutazione.LIVELLI) - 1)]
+        riepilogo["prossimo"] = np.where(ha_prossimo, prossimi, None)
+        riepilogo["target"] = soglie
+
+        # Giorni per arrivare alla soglia alla pendenza attuale (solo se si va nella direzione giusta)
+        giorni = (riepilogo["target"] - riepilogo["valore_norm"]) / riepilogo["pendenza"]
+        giorni = giorni.where((giorni > 0) & (giorni <= ORIZZONTE_MASSIMO.days))
+        riepilogo["data_prevista"] = riepilogo["data"] + pd.to_timedelta(np.ceil(giorni), unit="D")
+
+        self._serie = serie[COLONNE_SERIE]
+        self._posizioni = self._serie.groupby(["nome", "esercizio"], sort=False).indices
+        self._riepilogo = riepilogo.drop(columns=["genere"]).reset_index()
+
+    def serie(self, nome, esercizio):
+        """Tutti i test di un atleta su un esercizio, in ordine di data, con migliore e miglioramento."""
+        with self._lock:
+            posizioni = self._posizioni.get((nome, esercizio))
+            return self._serie.iloc[posizioni if posizioni is not None else []]
+
+    def riepilogo(self, nome=None):
+        """Una riga per (atleta, esercizio): ultimo valore, pendenza al giorno, prossimo livello e data prevista."""
+        with self._lock:
+            riepilogo = self._riepilogo
+        return riepilogo if nome is None else riepilogo[riepilogo["nome"] == nome]
+
+
+_tendenze = Tendenze()
+
+
+def tendenze():
+    """Tendenze di tutti gli atleti."""
+    return _tendenze.allinea()
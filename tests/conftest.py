@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import pytest
+
+import accesso
+import aree
+import classifiche
+import dati
+import livelli_correnti
+import richiami
+import tendenze
+import valutazione
+
+# Strutture condivise dei moduli: ogni test parte da istanze nuove
+STRUTTURE = [
+    (livelli_correnti, "_livelli"), (classifiche, "_classifiche"), (classifiche, "_classifiche_wod"),
+    (tendenze, "_tendenze"), (richiami, "_richiami"), (aree, "_matrice"), (accesso, "_credenziali"),
+]
+
+DATI_ESEMPIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fitness_app")
+
+
+@pytest.fixture
+def cartella(tmp_path, monkeypatch):
+    """Copia dei dati di esempio in una cartella temporanea, con cache e scrittori vuoti."""
+    cartella = tmp_path / "fitness_app"
+    # Copia senza le date di modifica originali: un'istantanea dei dati veri non risulta mai aggiornata
+    shutil.copytree(DATI_ESEMPIO, cartella, copy_function=shutil.copy,
+                    ignore=shutil.ignore_patterns("*.giornale.csv", "*.db", "istantanea"))
+    monkeypatch.setattr(dati, "CARTELLA_DATI", str(cartella))
+    monkeypatch.setattr(dati, "_archivio", dati.ArchivioCsv())
+    for stato in ("_cache", "_registro", "_scrittori", "_in_coda"):
+        monkeypatch.setattr(dati, stato, {})
+    for modulo, nome in STRUTTURE:
+        monkeypatch.setattr(modulo, nome, type(getattr(modulo, nome))())
+    monkeypatch.setattr(valutazione, "_indice", None)
+    monkeypatch.setattr(valutazione, "_indice_versione", None)
+    yield cartella
+    dati.attendi_scritture()
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def archivio(request, cartella, monkeypatch):
+    """Come ``cartella``, una volta con i CSV e una con le stesse tabelle migrate in SQLite."""
+    if request.param == "sqlite":
+        monkeypatch.setattr(dati, "_archivio", dati.migra_in_sqlite(str(cartella / "fitness.db")))
+    return request.param
+
+
+def ricarica():
+    """Svuota la cache: la prossima lettura rilegge le tabelle dall'archivio."""
+    dati.attendi_scritture()
+    dati._cache.clear()
@@ -0,0 +1,35 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import dati
+from conftest import ricarica
+
+NUOVO_TEST = {
+    "nome": "Joseph Lalla",
+    "esercizio": "Back Squat 1RM",
+    "valore": 90.0,
+    "tipo_valore": "kg_rel",
+    "peso_corporeo": 105.0,
+    "relativo": 0.86,
+    "data": "2025-06-01",
+    "genere": "Maschio",
+}
+
+
+def test_aggiungi_come_riletto_dal_disco(archivio):
+    in_memoria = dati.aggiungi("test", [NUOVO_TEST])
+    pa.Table.from_pandas(in_memoria)  # come st.dataframe: niente colonne con tipi misti
+    ricarica()
+    pd.testing.assert_frame_equal(in_memoria, dati.carica("test"))
+
+
+@pytest.mark.parametrize("crescente", [True, False])
+def test_sfoglia_test_senza_data_in_fondo(archivio, crescente):
+    dati.aggiungi("test", [dict(NUOVO_TEST, data=None)])
+    ricarica()
+    atteso = dati.carica("test")["data"].sort_values(ascending=crescente, kind="stable")
+    pagina, totale = dati.sfoglia("test", ordina_per="data", crescente=crescente, righe_per_pagina=len(atteso))
+    assert totale == len(atteso)
+    assert pd.isna(pagina["data"].iloc[-1])
+    assert list(pagina.index) == list(atteso.index)
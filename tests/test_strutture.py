@@ -0,0 +1,55 @@
+import warnings
+
+import pandas as pd
+
+import dati
+import istantanea
+from classifiche import Classifiche
+from livelli_correnti import LivelliCorrenti
+from richiami import Richiami
+from tendenze import Tendenze
+
+# Test salvato senza genere: vale quello del profilo (Femmina: 1.5 è "Buono", per un Maschio "Intermedio")
+SENZA_GENERE = {
+    "nome": "Magali Lino",
+    "esercizio": "Back Squat 1RM",
+    "valore": 90.0,
+    "tipo_valore": "kg_rel",
+    "peso_corporeo": 60.0,
+    "relativo": 1.5,
+    "data": "2026-01-01",
+    "genere": None,
+}
+
+
+def _ordinata(tabella):
+    return tabella.sort_values(["nome", "esercizio"]).reset_index(drop=True)
+
+
+def test_genere_dal_profilo_in_tutte_le_strutture(cartella):
+    livelli = LivelliCorrenti().allinea()
+    dati.aggiungi("test", [SENZA_GENERE])
+    ultimo = livelli.allinea().ultimo("Magali Lino", "Back Squat 1RM")
+    assert ultimo["livello"] == "Buono"
+
+    # Aggiornamento incrementale e ricostruzione danno la stessa tabella
+    pd.testing.assert_frame_equal(_ordinata(livelli.tabella()), _ordinata(LivelliCorrenti().allinea().tabella()))
+
+    riepilogo = Tendenze().allinea().riepilogo("Magali Lino").set_index("esercizio")
+    assert riepilogo.loc["Back Squat 1RM", "livello"] == "Buono"
+
+    prime = Classifiche().allinea().prime("Back Squat 1RM", "Femmina")
+    assert prime.set_index("nome").loc["Magali Lino", "livello"] == "Buono"
+
+    dati.attendi_scritture()
+    istantanea.crea(str(cartella / "istantanea"))
+    da_istantanea = istantanea.leggi("livelli", str(cartella / "istantanea")).set_index(["nome", "esercizio"])
+    assert da_istantanea.loc[("Magali Lino", "Back Squat 1RM"), "livello"] == "Buono"
+
+
+def test_richiami_senza_test(cartella):
+    dati.modifica("test", lambda df: df.iloc[:0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        richiami = Richiami().allinea()
+    assert richiami.scaduti().empty and richiami.in_scadenza().empty
@@ -0,0 +1,134 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import dati
+from dati import in_secondi
+
+# Livelli di valutazione, dal più basso al più alto
+LIVELLI = ["base", "principiante", "intermedio", "buono", "elite"]
+livelli_val = {livello: i + 1 for i, livello in enumerate(LIVELLI)}
+NON_VALUTABILE = "Non valutabile"
+
+# Etichetta per livello numerico (0 = nessuna soglia raggiunta)
+_ETICHETTE = np.array([NON_VALUTABILE] + [livello.capitalize() for livello in LIVELLI], dtype=object)
+
+
+def etichetta(livello_num):
+    return _ETICHETTE[livello_num]
+
+
+def formatta_secondi(secondi):
+    secondi = int(round(secondi))
+    return f"{secondi // 60:02d}:{secondi % 60:02d}"
+
+
+class IndiceBenchmark:
+    """Soglie del benchmark compilate una volta: (esercizio, genere) -> soglie numeriche + direzione."""
+
+    __slots__ = ("chiavi", "posizioni", "soglie", "tipi", "tempo")
+
+    def __init__(self, benchmark_df):
+        benchmark_df = benchmark_df.drop_duplicates(["esercizio", "genere"])
+        self.chiavi = pd.MultiIndex.from_frame(benchmark_df[["esercizio", "genere"]].astype(object))
+        self.posizioni = {chiave: i for i, chiave in enumerate(self.chiavi)}
+        self.tipi = benchmark_df["tipo_valore"].to_numpy(dtype=object)
+        self.tempo = self.tipi == "tempo"
+
+        # Le soglie sono salvate come testo misto ("10:00", "1.4"): le convertiamo una volta sola
+        soglie = np.empty((len(benchmark_df), len(LIVELLI)))
+        for j, livello in enumerate(LIVELLI):
+            colonna = benchmark_df[livello].reset_index(drop=True)
+            soglie[:, j] = in_secondi(colonna).where(pd.Series(self.tempo), pd.to_numeric(colonna, errors="coerce"))
+        self.soglie = soglie
+
+    def __len__(self):
+        return len(self.tipi)
+
+    def cerca(self, esercizio, genere):
+        """Posizione della riga di benchmark, oppure None."""
+        return self.posizioni.get((esercizio, genere))
+
+    def livello(self, esercizio, genere, valore):
+        """Livello numerico (0-5) di un singolo risultato già normalizzato."""
+        i = self.cerca(esercizio, genere)
+        if i is None:
+            return 0
+        return int(_livelli_raggiunti(np.array([valore], dtype=float), self.soglie[[i]], self.tempo[[i]])[0])
+
+    def prossimo_livello(self, esercizio, genere, livello_num):
+        """Livello successivo e relativa soglia (già formattata), oppure (None, None) se non esiste."""
+        i = self.cerca(esercizio, genere)
+        if i is None or livello_num < 1 or livello_num >= len(LIVELLI):
+            return None, None
+        target = self.soglie[i, livello_num]
+        if self.tempo[i]:
+            target = formatta_secondi(target)
+        return LIVELLI[livello_num], target
+
+
+_indice = None
+_indice_versione = None
+_indice_lock = threading.Lock()
+
+
+def indice_benchmark():
+    """Indice condiviso da tutte le sessioni, ricostruito solo quando benchmark.csv cambia."""
+    global _indice, _indice_versione
+    with _indice_lock, dati.ultime_versioni():
+        versione = dati.versione("benchmark")
+        if _indice is None or _indice_versione != versione:
+            _indice = IndiceBenchmark(dati.carica("benchmark"))
+            _indice_versione = versione
+        return _indice
+
+
+def _livelli_raggiunti(valori, matrice, tempo):
+    # Livello più alto la cui soglia è superata (meno tempo è meglio per "tempo")
+    with np.errstate(invalid="ignore"):
+        superate = np.where(tempo[:, None], valori[:, None] <= matrice, valori[:, None] >= matrice)
+    return np.where(superate.any(axis=1), len(LIVELLI) - np.argmax(superate[:, ::-1], axis=1), 0)
+
+
+def valore_normalizzato(test_df, tipo):
+    """Valore confrontabile con le soglie: secondi per il tempo, forza relativa per kg_rel."""
+    # valore_num arriva già calcolato dallo schema di dati.py; altrimenti lo ricaviamo qui
+    numerico = test_df["valore_num"] if "valore_num" in test_df else in_secondi(test_df["valore"])
+    relativo = numerico / pd.to_numeric(test_df["peso_corporeo"], errors="coerce")
+    if "relativo" in test_df:
+        relativo = pd.to_numeric(test_df["relativo"], errors="coerce").fillna(relativo)
+    return numerico.where(tipo != "kg_rel", relativo).astype(float)
+
+
+def generi_atleti():
+    """Genere dal profilo di ogni atleta (nome -> genere)."""
+    return dati.carica("utenti").drop_duplicates("nome").set_index("nome")["genere"]
+
+
+def con_genere(test_df, generi):
+    """``test_df`` con il genere mancante preso dal profilo dell'atleta (``generi``, vedi ``generi_atleti``)."""
+    genere = test_df["genere"] if "genere" in test_df else pd.Series(np.nan, index=test_df.index, dtype=object)
+    return test_df.assign(genere=genere.astype(object).fillna(test_df["nome"].astype(object).map(generi)))
+
+
+def valuta(test_df, indice=None, genere_predefinito=None):
+    """Assegna il livello a tutti i test in un solo passaggio vettoriale.
+
+    Aggiunge le colonne ``valore_norm``, ``livello`` (etichetta) e ``livello_num`` (0-5).
+    Il genere mancante sul test viene preso da ``genere_predefinito``.
+    """
+    if indice is None:
+        indice = indice_benchmark()
+    genere = test_df["genere"] if "genere" in test_df else pd.Series(np.nan, index=test_df.index, dtype=object)
+    genere = genere.astype(object).where(genere.notna(), genere_predefinito)
+
+    # Join con il benchmark su (esercizio, genere)
+    posizioni = indice.chiavi.get_indexer(pd.MultiIndex.from_arrays([test_df["esercizio"].astype(object), genere]))
+    trovato = posizioni >= 0
+    tipo = np.where(trovato, indice.tipi[posizioni], test_df["tipo_valore"].astype(object).to_numpy())
+
+    valore = valore_normalizzato(test_df, pd.Series(tipo, index=test_df.index)).to_numpy()
+    livello_num = _livelli_raggiunti(valore, indice.soglie[posizioni], tipo == "tempo")
+    livello_num = np.where(trovato, livello_num, 0)
+    return test_df.assign(valore_norm=valore, livello=_ETICHETTE[livello_num], livello_num=livello_num)